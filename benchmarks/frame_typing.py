@@ -0,0 +1,62 @@
+"""Compare memory and filter latency of the string-typed and typed lead frames.
+
+    python -m benchmarks.frame_typing --rows 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_leads
+from utils.data_handler import _typed_frame, filter_leads
+
+FILTERS = {"month": 3, "status_filter": ["Student", "Working"], "call_status_filter": ["Call taken"]}
+REPEATS = 5
+
+
+def filter_string_frame(leads, month=None, status_filter=None, call_status_filter=None):
+    """The filter as it worked on the string frame, re-parsing created_at each call"""
+    filtered = leads
+    if month and month != "All":
+        created_at = pd.to_datetime(filtered["created_at"], errors="coerce")
+        filtered = filtered[created_at.dt.month == int(month)]
+    if status_filter:
+        filtered = filtered[filtered["lead_status"].isin(status_filter)]
+    if call_status_filter:
+        filtered = filtered[filtered["call_status"].isin(call_status_filter)]
+    return filtered
+
+
+def _best_ms(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2), result
+
+
+def run(rows):
+    leads = synthetic_leads(rows).astype(object)
+    typing_ms, typed = _best_ms(lambda: _typed_frame(leads.copy()))
+    string_ms, string_result = _best_ms(filter_string_frame, leads, **FILTERS)
+    typed_ms, typed_result = _best_ms(filter_leads, typed, **FILTERS)
+    assert len(string_result) == len(typed_result)
+    return {
+        "rows": rows,
+        "matches": len(typed_result),
+        "string_frame_mb": round(leads.memory_usage(deep=True).sum() / 2**20, 1),
+        "typed_frame_mb": round(typed.memory_usage(deep=True).sum() / 2**20, 1),
+        "typing_ms": typing_ms,
+        "string_filter_ms": string_ms,
+        "typed_filter_ms": typed_ms,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the typed lead frame against plain strings")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(json.dumps([run(rows) for rows in args.rows], indent=2))
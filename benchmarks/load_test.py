@@ -0,0 +1,326 @@
+"""Benchmark and load test for the lead workflows.
+
+Each dataset size runs in its own process against a throwaway database:
+
+    python -m benchmarks.load_test --rows 1000 10000 100000 --users 8 --output results.json
+
+Results are written as JSON so runs can be compared for regressions. Run it
+from the project root so the page renders find main.py and assets/.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit
+
+from benchmarks.synthetic import synthetic_leads, synthetic_users
+from utils import auth, data_handler, db, jobs
+from utils.pdf_generator import MAX_ROWS as MAX_PDF_ROWS, generate_pdf
+
+PASSWORD = "benchmark"
+REPEATS = 5
+SEED_BATCH = 10_000
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+# Values of st.session_state.page, as set by the sidebar navigation
+USER_PAGES = ["Add Lead", "View Leads", "Generate Reports", "Daily Summary"]
+ADMIN_PAGES = USER_PAGES + ["Team Analytics", "Admin Console"]
+
+
+def _summary(samples):
+    """Latency percentiles in milliseconds"""
+    if not samples:
+        return {"runs": 0}
+    ms = np.array(samples) * 1000
+    return {
+        "runs": len(samples),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def _time(func, repeats=REPEATS, before=None):
+    samples = []
+    for _ in range(repeats):
+        if before:
+            before()
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return _summary(samples)
+
+
+def use_workdir(workdir):
+    """Point the lead store, job artifacts and legacy CSV at a scratch directory"""
+    db.DB_FILE = os.path.join(workdir, "users.db")
+    data_handler.DATA_FILE = os.path.join(workdir, "leads_data.csv")
+    jobs.ARTIFACT_DIR = os.path.join(workdir, "report_cache")
+
+
+def seed(rows, users):
+    """Create the benchmark users and insert synthetic leads in batches"""
+    auth.create_user("admin", PASSWORD, is_admin=True)
+    for username in users:
+        auth.create_user(username, PASSWORD)
+    leads = synthetic_leads(rows, users)
+    started = time.perf_counter()
+    for start in range(0, rows, SEED_BATCH):
+        batch = leads.iloc[start:start + SEED_BATCH]
+        data_handler.save_leads_bulk(batch.replace({"": None}).to_dict("records"), "admin")
+    return round(time.perf_counter() - started, 3)
+
+
+def time_reads(users):
+    """Time the read paths the pages call, as an admin and as one user"""
+    month = datetime.now().month
+    today = datetime.now().date()
+    # The public frame API: the process-wide lead cache, reloaded and then hit, and the typed filter
+    timings = {
+        "load_leads_cold": _time(
+            lambda: data_handler.load_leads(is_admin=True), before=data_handler._invalidate_cache
+        ),
+        "load_leads_warm": _time(lambda: data_handler.load_leads(is_admin=True)),
+        "load_leads_user": _time(lambda: data_handler.load_leads(users[0])),
+    }
+    leads = data_handler.load_leads(is_admin=True)
+    timings["filter_leads"] = _time(
+        lambda: data_handler.filter_leads(leads, month, ["Student"], ["Call taken"])
+    )
+    for role, filters in [("admin", {"is_admin": True}), ("user", {"username": users[0]})]:
+        # View Leads: count, one page, the selected lead and its notes
+        timings[f"count_leads_{role}"] = _time(lambda: data_handler.count_leads(month=month, **filters))
+        timings[f"load_leads_page_{role}"] = _time(
+            lambda: data_handler.load_leads_page(page=3, page_size=50, status_filter=["Student"], **filters)
+        )
+        timings[f"search_{role}"] = _time(
+            lambda: data_handler.load_leads_page(page_size=25, search="python call", **filters)
+        )
+        lead_id = int(data_handler.load_leads_page(page_size=1, **filters).index[0])
+        timings[f"get_lead_{role}"] = _time(lambda: data_handler.get_lead(lead_id))
+        timings[f"get_followup_notes_{role}"] = _time(lambda: data_handler.get_followup_notes(lead_id))
+        timings[f"trash_page_{role}"] = _time(
+            lambda: (data_handler.count_deleted_leads(**filters), data_handler.get_deleted_leads(**filters))
+        )
+        # Daily Summary
+        timings[f"generate_daily_report_{role}"] = _time(
+            lambda: data_handler.generate_daily_report(**filters)
+        )
+        timings[f"generate_monthly_report_{role}"] = _time(
+            lambda: data_handler.generate_monthly_report(month=month, **filters)
+        )
+        # View Leads sidebar
+        for window in ("today", "overdue"):
+            timings[f"get_pending_followups_{window}_{role}"] = _time(
+                lambda: data_handler.get_pending_followups(window=window, limit=20, **filters)
+            )
+            timings[f"count_pending_followups_{window}_{role}"] = _time(
+                lambda: data_handler.count_pending_followups(window=window, **filters)
+            )
+    timings["get_lead_creators"] = _time(data_handler.get_lead_creators)
+    # Team Analytics, rebuilt and then served from its per-version cache
+    timings["get_team_analytics_cold"] = _time(
+        data_handler.get_team_analytics,
+        before=lambda: data_handler._analytics_cache.update(version=None, results={})
+    )
+    timings["get_team_analytics_warm"] = _time(data_handler.get_team_analytics)
+    # Export jobs read every matching lead, with its notes, a chunk at a time
+    timings["export_chunks_admin"] = _time(
+        lambda: sum(len(chunk) for chunk in data_handler.iter_filtered_leads(
+            jobs.EXPORT_CHUNK_SIZE, with_notes=True, is_admin=True
+        )),
+        repeats=1
+    )
+    start_date = today - timedelta(days=30)
+    pdf_leads = data_handler.count_leads_between(start_date, today, is_admin=True)
+    if pdf_leads <= MAX_PDF_ROWS:
+        timings["generate_pdf_30_days"] = _time(
+            lambda: generate_pdf(
+                data_handler.iter_leads_by_date(start_date, today, is_admin=True), start_date, today,
+                buffer=io.BytesIO()
+            ),
+            repeats=1
+        )
+    else:
+        timings["generate_pdf_30_days"] = {"runs": 0, "skipped": f"over the {MAX_PDF_ROWS:,} row PDF limit"}
+    timings["generate_pdf_30_days"]["leads"] = pdf_leads
+    return timings
+
+
+def _writer(username, ops, seed, results):
+    """One simulated user adding, editing, noting and deleting their leads"""
+    rng = random.Random(seed)
+    own = list(data_handler.load_leads_page(page_size=50, username=username).index)
+    latencies = {"save_lead": [], "update_lead": [], "add_followup_note": [], "delete_lead": [],
+                 "load_leads_page": []}
+    conflicts = errors = 0
+    for i in range(ops):
+        op = rng.choices(list(latencies), weights=[3, 4, 3, 1, 4])[0]
+        started = time.perf_counter()
+        try:
+            if op == "save_lead":
+                own.append(data_handler.save_lead({
+                    "name": f"{username} lead {i}",
+                    "phone": f"8{seed:03d}{i:06d}",
+                    "lead_status": "Student",
+                    "call_status": "Busy",
+                }, username))
+            elif op == "load_leads_page":
+                data_handler.load_leads_page(page_size=25, username=username)
+            elif own:
+                lead_id = rng.choice(own)
+                lead = data_handler.get_lead(lead_id)
+                if lead is None:
+                    own.remove(lead_id)
+                    continue
+                if op == "update_lead":
+                    data_handler.update_lead(
+                        lead_id, {"call_status": "Call taken"}, expected_version=lead["version"]
+                    )
+                elif op == "add_followup_note":
+                    data_handler.add_followup_note(lead_id, f"note {i}", username, "Pending")
+                else:
+                    data_handler.delete_lead(lead_id, username, expected_version=lead["version"])
+                    own.remove(lead_id)
+            else:
+                continue
+        except data_handler.LeadConflictError:
+            conflicts += 1
+        except Exception as e:
+            print(f"Error in {op} for {username}: {str(e)}", file=sys.stderr)
+            errors += 1
+        latencies[op].append(time.perf_counter() - started)
+    results[username] = (latencies, conflicts, errors)
+
+
+def run_writers(users, ops):
+    """Run concurrent simulated users and summarize write latency and throughput"""
+    results = {}
+    threads = [
+        threading.Thread(target=_writer, args=(username, ops, i, results))
+        for i, username in enumerate(users)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    merged = {}
+    for latencies, _, _ in results.values():
+        for op, samples in latencies.items():
+            merged.setdefault(op, []).extend(samples)
+    total = sum(len(samples) for samples in merged.values())
+    return {
+        "users": len(users),
+        "ops_per_user": ops,
+        "seconds": round(seconds, 3),
+        "ops_per_sec": round(total / seconds, 1) if seconds else 0.0,
+        "conflicts": sum(r[1] for r in results.values()),
+        "errors": sum(r[2] for r in results.values()),
+        "latency": {op: _summary(samples) for op, samples in merged.items()},
+    }
+
+
+def time_renders(users, script=APP_SCRIPT):
+    """Time full page runs through Streamlit's AppTest harness"""
+    from streamlit.testing.v1 import AppTest
+
+    renders = {}
+    logins = [("admin", ADMIN_PAGES), (users[0], USER_PAGES)]
+    for username, pages in logins:
+        token = auth.create_session(auth.authenticate(username, PASSWORD))
+        for page in pages:
+            samples, failure = [], None
+            for _ in range(REPEATS):
+                at = AppTest.from_file(script, default_timeout=120)
+                at.session_state["auth_token"] = token
+                at.session_state["page"] = page
+                started = time.perf_counter()
+                at.run()
+                samples.append(time.perf_counter() - started)
+                if at.exception:
+                    failure = at.exception[0].message
+                    break
+            result = _summary(samples)
+            if failure:
+                result["error"] = failure
+            renders[f"{page} ({'admin' if username == 'admin' else 'user'})"] = result
+    return renders
+
+
+def run(rows, users, ops, renders=True):
+    """Benchmark one dataset size in a scratch directory"""
+    user_names = synthetic_users(users)
+    with tempfile.TemporaryDirectory(prefix="leads-bench-") as workdir:
+        use_workdir(workdir)
+        result = {"rows": rows, "seed_seconds": seed(rows, user_names)}
+        result["reads"] = time_reads(user_names)
+        result["writes"] = run_writers(user_names, ops)
+        if renders:
+            result["renders"] = time_renders(user_names)
+        # Fold the WAL back into the main file first, or recent writes would not be counted
+        with db.connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        result["db_mb"] = round(os.path.getsize(db.DB_FILE) / 2**20, 1)
+        db.close_all()
+    return result
+
+
+def environment():
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the lead workflows on synthetic data")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--users", type=int, default=8, help="concurrent simulated users")
+    parser.add_argument("--ops", type=int, default=50, help="operations per simulated user")
+    parser.add_argument("--no-renders", action="store_true", help="skip the AppTest page renders")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run(args.rows[0], args.users, args.ops, not args.no_renders)))
+        sys.exit(0)
+
+    # A fresh process per size keeps module caches and memory from leaking between runs
+    runs = []
+    for rows in args.rows:
+        command = [sys.executable, "-m", "benchmarks.load_test", "--single", "--rows", str(rows),
+                   "--users", str(args.users), "--ops", str(args.ops)]
+        if args.no_renders:
+            command.append("--no-renders")
+        completed = subprocess.run(command, capture_output=True, text=True)
+        if completed.returncode != 0:
+            runs.append({"rows": rows, "error": (completed.stderr.strip().splitlines() or [""])[-1]})
+            continue
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    report = json.dumps({"environment": environment(), "runs": runs}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
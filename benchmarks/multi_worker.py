@@ -0,0 +1,128 @@
+"""Check that several app processes can share one data directory.
+
+Spawns worker processes against the same LEADS_DATA_DIR. They start
+together (racing the schema migrations), write leads concurrently, then
+check that each one's cached lead frame picked up every other worker's
+writes and that they all share a single export job:
+
+    python -m benchmarks.multi_worker --workers 4 --leads 200
+
+Prints a JSON summary and exits non-zero if any check fails.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BARRIER_TIMEOUT = 120
+
+
+def _barrier(data_dir, name, worker, workers):
+    """Wait until every worker has reached the named point"""
+    open(os.path.join(data_dir, f"{name}.{worker}"), "w").close()
+    deadline = time.monotonic() + BARRIER_TIMEOUT
+    while sum(os.path.exists(os.path.join(data_dir, f"{name}.{i}")) for i in range(workers)) < workers:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Workers did not all reach {name}")
+        time.sleep(0.05)
+
+
+def worker(index, workers, leads, data_dir):
+    """Run inside a worker process; LEADS_DATA_DIR must already point at data_dir"""
+    from utils import auth, data_handler, jobs
+
+    result = {"worker": index, "pid": os.getpid(), "errors": []}
+    _barrier(data_dir, "start", index, workers)
+    started = time.perf_counter()
+    auth.init_users()
+    jobs.init_jobs()
+    result["init_seconds"] = round(time.perf_counter() - started, 3)
+
+    username = f"worker{index}"
+    for i in range(leads):
+        try:
+            data_handler.save_lead({"name": f"{username} lead {i}", "phone": f"7{index:03d}{i:06d}"}, username)
+            # Keep the shared-frame cache busy while other processes write
+            if i % 20 == 0:
+                data_handler.load_leads(is_admin=True)
+        except Exception as e:
+            result["errors"].append(str(e))
+
+    _barrier(data_dir, "written", index, workers)
+    result["data_version"] = data_handler.get_data_version()
+    result["rows_seen"] = len(data_handler.load_leads(is_admin=True))
+    result["cache"] = data_handler.get_cache_stats()
+
+    job_id = jobs.submit_job("csv_export", "admin", {"is_admin": True})
+    result["job_id"] = job_id
+    deadline = time.monotonic() + BARRIER_TIMEOUT
+    while True:
+        job = jobs.get_job(job_id)
+        if job["status"] not in jobs.PENDING_STATUSES or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    result["job_status"] = job["status"]
+    if job["status"] == "done":
+        with open(job["artifact_path"]) as f:
+            result["exported_rows"] = sum(1 for _ in f) - 1
+    # The process that owns the job must stay up until everyone has read it
+    _barrier(data_dir, "done", index, workers)
+    return result
+
+
+def run(workers, leads, data_dir):
+    env = {**os.environ, "LEADS_DATA_DIR": data_dir}
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.multi_worker", "--worker", str(i),
+             "--workers", str(workers), "--leads", str(leads), "--data-dir", data_dir],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for i in range(workers)
+    ]
+    results = []
+    for process in processes:
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            results.append({"error": (stderr.strip().splitlines() or [""])[-1]})
+        else:
+            results.append(json.loads(stdout.strip().splitlines()[-1]))
+
+    for name in os.listdir(data_dir):
+        if name.split(".")[0] in ("start", "written", "done"):
+            os.remove(os.path.join(data_dir, name))
+
+    expected = workers * leads
+    checks = {
+        "all_workers_finished": all("error" not in r for r in results),
+        "no_write_errors": all(not r.get("errors") for r in results),
+        "every_cache_saw_every_write": all(r.get("rows_seen") == expected for r in results),
+        "one_shared_export_job": len({r.get("job_id") for r in results}) == 1,
+        "export_complete": all(r.get("exported_rows") == expected for r in results),
+    }
+    return {"workers": workers, "leads_per_worker": leads, "data_dir": data_dir,
+            "checks": checks, "ok": all(checks.values()), "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several workers against one data directory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--leads", type=int, default=200, help="leads written by each worker")
+    parser.add_argument("--data-dir", help="empty shared data directory; a temporary one by default")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(worker(args.worker, args.workers, args.leads, args.data_dir)))
+        sys.exit(0)
+
+    if args.data_dir:
+        summary = run(args.workers, args.leads, os.path.abspath(args.data_dir))
+    else:
+        with tempfile.TemporaryDirectory(prefix="leads-workers-") as data_dir:
+            summary = run(args.workers, args.leads, data_dir)
+    print(json.dumps(summary, indent=2))
+    sys.exit(0 if summary["ok"] else 1)
@@ -0,0 +1,102 @@
+"""Track the import cost of each entry point with `python -X importtime`.
+
+    python -m benchmarks.startup --repeats 5
+
+Each target is imported in a fresh interpreter. The report gives the median
+cumulative import time, the slowest modules, and which heavy dependencies
+were loaded. It also times a cold render of the login page.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    "login": "utils.auth",
+    "add_lead_page": "views.add_lead",
+    "leads_page": "views.leads",
+    "reports_page": "views.reports",
+    "analytics_page": "views.analytics",
+    "pdf_generator": "utils.pdf_generator",
+}
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "reportlab", "openpyxl"]
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+LOGIN_RENDER = f"""
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP_SCRIPT!r}, default_timeout=60)
+at.run()
+print(json.dumps({{
+    "ms": (time.perf_counter() - started) * 1000,
+    "error": at.exception[0].message if at.exception else None,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _importtime(module):
+    """Import a module in a fresh interpreter and parse the -X importtime report"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return entries
+
+
+def measure(module, repeats):
+    totals = []
+    for _ in range(repeats):
+        entries = _importtime(module)
+        # Top-level imports are not indented; their cumulative times add up to the total
+        totals.append(sum(cumulative for _, cumulative, name in entries if not name.startswith("  ")))
+    loaded = {name.strip() for _, _, name in entries}
+    slowest = sorted(entries, key=lambda entry: entry[0], reverse=True)[:10]
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(totals) / 1000, 1),
+        "modules_loaded": len(loaded),
+        "heavy_modules": [m for m in HEAVY_MODULES if m in loaded],
+        "slowest_self_ms": {name.strip(): round(self_us / 1000, 1) for self_us, _, name in slowest},
+    }
+
+
+def login_render(repeats):
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, "-c", LOGIN_RENDER], capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {"error": (completed.stderr.strip().splitlines() or [""])[-1]}
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {
+        "cold_render_ms": round(statistics.median(run["ms"] for run in runs), 1),
+        "error": runs[-1]["error"],
+        "heavy_modules": runs[-1]["heavy"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import and cold start cost")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps({
+        "python": sys.version.split()[0],
+        "imports": {name: measure(module, args.repeats) for name, module in TARGETS.items()},
+        "login_page": login_render(args.repeats),
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
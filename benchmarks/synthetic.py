@@ -0,0 +1,39 @@
+"""Synthetic lead data shared by the benchmarks"""
+import numpy as np
+import pandas as pd
+
+from utils.data_handler import CALL_STATUSES, LEAD_COLUMNS, LEAD_STATUSES, LEAD_TEMPERATURES
+
+FOLLOWUP_STATUSES = ["Pending", "Completed", "Rescheduled", "No Response"]
+NOTE_WORDS = ["callback", "python", "java", "fees", "placement", "weekend", "batch", "demo", "parent", "loan"]
+
+
+def synthetic_users(count=20):
+    return [f"user{i}" for i in range(count)]
+
+
+def synthetic_leads(rows, users=None, seed=0):
+    """Build a lead frame of strings spread over the last year, as stored in SQLite"""
+    rng = np.random.default_rng(seed)
+    users = users or synthetic_users()
+    start = pd.Timestamp.now().normalize() - pd.Timedelta(days=365)
+    created = start + pd.to_timedelta(rng.integers(0, 366 * 86400, rows), unit="s")
+    created_at = created.strftime("%Y-%m-%d %H:%M:%S")
+    followup = (created + pd.to_timedelta(rng.integers(1, 30, rows), unit="D")).strftime("%Y-%m-%d")
+    notes = pd.Series(rng.choice(NOTE_WORDS, rows)) + " " + pd.Series(rng.choice(NOTE_WORDS, rows))
+    return pd.DataFrame({
+        "name": [f"Lead {i}" for i in range(rows)],
+        "phone": [f"9{i:09d}" for i in range(rows)],
+        "email": [f"lead{i}@example.com" for i in range(rows)],
+        "lead_status": rng.choice(LEAD_STATUSES, rows),
+        "call_status": rng.choice(CALL_STATUSES, rows),
+        "notes": notes,
+        "date_added": created_at,
+        "last_followup": created_at,
+        "lead_temperature": rng.choice(LEAD_TEMPERATURES, rows),
+        "created_by": rng.choice(users, rows),
+        "created_at": created_at,
+        "details_shared": rng.integers(0, 2, rows).astype(bool),
+        "next_followup": followup,
+        "followup_status": rng.choice(FOLLOWUP_STATUSES, rows),
+    }, columns=LEAD_COLUMNS)
@@ -0,0 +1,31 @@
+import pytest
+
+from utils import data_handler, db
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """Point the lead store at an empty database in a temporary directory"""
+    monkeypatch.setattr(db, "DB_FILE", str(tmp_path / "users.db"))
+    monkeypatch.setattr(data_handler, "DATA_FILE", str(tmp_path / "leads_data.csv"))
+    monkeypatch.setattr(data_handler, "_initialized", False)
+    # Data versions restart with each store, so cached frames must not carry over
+    monkeypatch.setattr(data_handler, "_cache", {"version": None, "frame": None})
+    monkeypatch.setattr(data_handler, "_cache_stats", {"hits": 0, "misses": 0, "invalidations": 0})
+    monkeypatch.setattr(data_handler, "_analytics_cache", {"version": None, "results": {}})
+    yield tmp_path
+    db.close_all()
+
+
+def make_lead(**fields):
+    """A valid lead dict, with any field overridden"""
+    return {
+        "name": "Asha",
+        "phone": "9876543210",
+        "email": "asha@example.com",
+        "lead_status": "Student",
+        "call_status": "Busy",
+        "lead_temperature": "Hot",
+        "created_at": "2026-03-02 10:00:00",
+        **fields,
+    }
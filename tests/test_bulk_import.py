@@ -0,0 +1,148 @@
+import io
+
+from tests.conftest import make_lead
+from utils import data_handler, db
+from utils.bulk_import import import_leads
+from utils.data_handler import count_followup_notes, count_leads, load_leads_page, save_lead
+
+
+def _csv(*lines):
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+def test_imported_leads_belong_to_the_importing_user():
+    report = import_leads(_csv(
+        "name,phone,created_by",
+        "Asha,9876543210,",
+        "Ravi,9123456780,mallory",
+    ), "bob")
+
+    assert report["accepted"] == 2
+    assert count_leads(username="bob") == 2
+    assert count_leads(username="mallory") == 0
+    assert set(load_leads_page(username="bob")["name"]) == {"Asha", "Ravi"}
+
+
+def test_upload_cannot_set_followup_notes():
+    import_leads(_csv("name,phone,followup_notes", "Asha,9876543210,called twice"), "bob")
+
+    lead_id = load_leads_page(username="bob").index[0]
+    with db.connection() as conn:
+        stored = conn.execute("SELECT followup_notes FROM leads WHERE id = ?", (int(lead_id),)).fetchone()
+    assert stored[0] is None
+    assert count_followup_notes(lead_id) == 0
+
+
+def test_invalid_rows_are_rejected_with_their_row_number():
+    report = import_leads(_csv(
+        "Name,Phone,Lead Status,Lead Temperature",
+        "Asha,9876543210,student,hot",
+        ",9123456780,Student,Hot",
+        "Ravi,,Student,Hot",
+        "Meena,9000000001,Retired,Hot",
+        "Kiran,9000000002,Student,Warm",
+    ), "bob")
+
+    assert report["rows"] == 5
+    assert report["accepted"] == 1
+    assert report["rejected"] == 4
+    assert report["rejected_rows"] == [
+        {"row": 3, "reason": "missing name"},
+        {"row": 4, "reason": "missing phone"},
+        {"row": 5, "reason": "invalid lead_status"},
+        {"row": 6, "reason": "invalid lead_temperature"},
+    ]
+    lead = load_leads_page(username="bob").iloc[0]
+    assert (lead["lead_status"], lead["lead_temperature"]) == ("Student", "Hot")
+
+
+def test_existing_phone_and_email_are_duplicates():
+    save_lead(make_lead(phone=" 98765 43210 ", email="Asha@Example.com"), "carol")
+
+    report = import_leads(_csv(
+        "name,phone,email",
+        "Asha,98765-43210,",
+        "Asha again,9876543210,",
+        "Asha by email,9000000001,asha@example.COM",
+        "Ravi,9123456780,ravi@example.com",
+    ), "bob")
+
+    assert report["duplicates"] == 3
+    assert report["accepted"] == 1
+    assert count_leads(username="bob") == 1
+
+
+def test_repeated_rows_in_one_file_are_duplicates_across_chunks():
+    report = import_leads(_csv(
+        "name,phone,email",
+        "Asha,9876543210,asha@example.com",
+        "Ravi,9123456780,",
+        "Asha copy,98765-43210,",
+        "Ravi by email,9000000001,ASHA@example.com",
+        "Ravi copy,9123456780,",
+    ), "bob", chunk_size=2)
+
+    assert report["accepted"] == 2
+    assert report["duplicates"] == 3
+
+
+def test_form_and_import_store_the_same_phone_format():
+    lead_id = save_lead(make_lead(phone="98765 43210"), "bob")
+
+    assert load_leads_page(username="bob").loc[lead_id, "phone"] == "9876543210"
+
+
+def test_phones_stored_before_normalization_are_migrated(monkeypatch):
+    lead_id = save_lead(make_lead(), "bob")
+    with db.connection() as conn:
+        with conn:
+            conn.execute("UPDATE leads SET phone = '98765 43210' WHERE id = ?", (lead_id,))
+            conn.execute("DELETE FROM store_meta WHERE key = 'phones_normalized'")
+    monkeypatch.setattr(data_handler, "_initialized", False)
+
+    report = import_leads(_csv("name,phone", "Asha,9876543210"), "bob")
+
+    assert report["duplicates"] == 1
+    assert load_leads_page(username="bob").loc[lead_id, "phone"] == "9876543210"
+
+
+def test_dates_are_stored_as_iso_and_unparseable_dates_rejected():
+    report = import_leads(_csv(
+        "name,phone,created_at,next_followup,last_followup",
+        "Asha,9876543210,2025-03-10,2025-03-12 09:00,2025-03-10T15:30:00",
+        "Ravi,9123456780,10/03/2025,,",
+        "Meena,9000000001,2025-03-10 10:00:00,tomorrow,",
+        "Kiran,9000000002,2025-02-30,,",
+    ), "bob")
+
+    assert report["accepted"] == 1
+    assert report["rejected_rows"] == [
+        {"row": 3, "reason": "invalid created_at"},
+        {"row": 4, "reason": "invalid next_followup"},
+        {"row": 5, "reason": "invalid created_at"},
+    ]
+    with db.connection() as conn:
+        stored = conn.execute("SELECT created_at, next_followup, last_followup, date_added FROM leads").fetchone()
+    assert tuple(stored) == ("2025-03-10 00:00:00", "2025-03-12", "2025-03-10 15:30:00", "2025-03-10 00:00:00")
+
+
+def test_xlsx_files_are_streamed_in_chunks(tmp_path):
+    from datetime import datetime
+
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Name", "Phone", "Email", "Created At"])
+    sheet.append(["Asha", 9876543210, "asha@example.com", datetime(2025, 3, 10, 9, 30)])
+    sheet.append(["Ravi", "91234 56780", None, None])
+    sheet.append(["Asha again", 9876543210, None, None])
+    path = tmp_path / "leads.xlsx"
+    workbook.save(path)
+
+    report = import_leads(str(path), "bob", chunk_size=2)
+
+    assert (report["rows"], report["accepted"], report["duplicates"]) == (3, 2, 1)
+    leads = load_leads_page(username="bob")
+    assert set(leads["phone"]) == {"9876543210", "9123456780"}
+    assert str(leads.loc[leads["name"] == "Asha", "created_at"].iloc[0]) == "2025-03-10 09:30:00"
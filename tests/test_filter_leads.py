@@ -0,0 +1,30 @@
+import pandas as pd
+
+from tests.conftest import make_lead
+from utils.data_handler import filter_leads, load_leads, save_lead
+
+
+def _store_leads():
+    save_lead(make_lead(), "bob")
+    save_lead(make_lead(name="Ravi", phone="9123456780", email="", lead_status="Working",
+                        call_status="Call taken", created_at="2026-04-11 09:30:00"), "eve")
+    save_lead(make_lead(name="Meena", phone="9000000001", email="", call_status="Call taken"), "eve")
+    return load_leads(is_admin=True)
+
+
+def test_loaded_frame_has_parsed_and_categorical_columns():
+    leads = _store_leads()
+
+    assert pd.api.types.is_datetime64_any_dtype(leads["created_at"])
+    for column in ("lead_status", "call_status", "lead_temperature", "followup_status", "created_by"):
+        assert isinstance(leads[column].dtype, pd.CategoricalDtype)
+
+
+def test_filters_combine_as_one_mask():
+    leads = _store_leads()
+
+    assert filter_leads(leads, month=3)["name"].tolist() == ["Asha", "Meena"]
+    assert filter_leads(leads, month="All", status_filter=["Working"])["name"].tolist() == ["Ravi"]
+    assert filter_leads(leads, month=3, call_status_filter=["Call taken"])["name"].tolist() == ["Meena"]
+    assert filter_leads(leads, creators=["eve"], month=4)["name"].tolist() == ["Ravi"]
+    assert len(filter_leads(leads)) == 3
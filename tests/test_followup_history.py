@@ -0,0 +1,68 @@
+import pytest
+
+from tests.conftest import make_lead
+from utils import data_handler
+from utils.data_handler import (
+    LeadConflictError, _split_followup_notes, count_followup_notes, get_followup_notes, get_lead,
+    save_lead, update_lead
+)
+
+
+def test_legacy_blob_skips_nan_lines_and_keeps_timestamps():
+    text = "nan\n[2025-02-10 03:52:05] called, no answer\n[2025-02-11 10:00:00] interested"
+
+    assert _split_followup_notes(text) == [
+        ("2025-02-10 03:52:05", "called, no answer"),
+        ("2025-02-11 10:00:00", "interested"),
+    ]
+
+
+def test_legacy_continuation_lines_join_the_previous_note():
+    text = "[2025-02-10 03:52:05] called\nasked for a brochure\n\n[2025-02-12 09:15:00] sent"
+
+    assert _split_followup_notes(text) == [
+        ("2025-02-10 03:52:05", "called\nasked for a brochure"),
+        ("2025-02-12 09:15:00", "sent"),
+    ]
+
+
+def test_legacy_untimestamped_text_uses_the_fallback_time():
+    assert _split_followup_notes("NaN\nplain note", "2025-02-10 06:00:00") == [
+        ("2025-02-10 06:00:00", "plain note"),
+    ]
+    assert _split_followup_notes("nan") == []
+    assert _split_followup_notes("") == []
+
+
+def test_update_saves_the_note_with_the_lead():
+    lead_id = save_lead(make_lead(), "bob")
+
+    assert update_lead(lead_id, {"followup_status": "Rescheduled"}, expected_version=1,
+                       note="call back friday", author="bob")
+
+    assert get_lead(lead_id)["version"] == 2
+    [note] = get_followup_notes(lead_id)
+    assert (note["note"], note["author"], note["status"]) == ("call back friday", "bob", "Rescheduled")
+
+
+def test_conflicting_update_does_not_save_the_note():
+    lead_id = save_lead(make_lead(), "bob")
+    update_lead(lead_id, {"call_status": "RNP"})
+
+    with pytest.raises(LeadConflictError):
+        update_lead(lead_id, {"call_status": "Busy"}, expected_version=1, note="lost", author="bob")
+
+    assert count_followup_notes(lead_id) == 0
+
+
+def test_failed_note_rolls_back_the_update(monkeypatch):
+    lead_id = save_lead(make_lead(), "bob")
+
+    def fail(*args):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(data_handler, "_insert_followup_note", fail)
+
+    assert not update_lead(lead_id, {"call_status": "Abroad"}, expected_version=1, note="x", author="bob")
+
+    lead = get_lead(lead_id)
+    assert (lead["call_status"], lead["version"]) == ("Busy", 1)
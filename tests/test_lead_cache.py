@@ -0,0 +1,66 @@
+from tests.conftest import make_lead
+from utils import db
+from utils.data_handler import (
+    delete_lead, get_cache_stats, load_leads, save_lead, update_lead
+)
+
+
+def test_repeated_loads_hit_the_cache():
+    save_lead(make_lead(), "bob")
+
+    load_leads(is_admin=True)
+    load_leads(is_admin=True)
+
+    stats = get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["rows"] == 1
+
+
+def test_per_user_views_share_one_cached_frame():
+    save_lead(make_lead(), "bob")
+    save_lead(make_lead(name="Ravi", phone="9123456780", email=""), "eve")
+
+    assert len(load_leads(is_admin=True)) == 2
+    assert len(load_leads("bob")) == 1
+    assert len(load_leads("eve")) == 1
+
+    stats = get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_writes_invalidate_the_cache():
+    lead_id = save_lead(make_lead(), "bob")
+    load_leads("bob")
+
+    update_lead(lead_id, {"call_status": "Abroad"})
+    assert load_leads("bob").loc[lead_id, "call_status"] == "Abroad"
+
+    delete_lead(lead_id, deleted_by="bob")
+    assert load_leads("bob").empty
+
+    stats = get_cache_stats()
+    assert stats["misses"] == 3
+    assert stats["invalidations"] >= 3
+
+
+def test_write_from_another_process_is_picked_up_by_version():
+    save_lead(make_lead(), "bob")
+    load_leads("bob")
+
+    # Another worker's write: only the shared data version tells this process
+    with db.connection() as conn:
+        with conn:
+            conn.execute("UPDATE leads SET name = 'Changed'")
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'data_version'")
+
+    assert load_leads("bob")["name"].tolist() == ["Changed"]
+    assert get_cache_stats()["misses"] == 2
+
+
+def test_callers_get_a_copy_of_the_cached_frame():
+    save_lead(make_lead(), "bob")
+
+    leads = load_leads("bob")
+    leads["name"] = "Mutated"
+
+    assert load_leads("bob")["name"].tolist() == ["Asha"]
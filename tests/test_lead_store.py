@@ -0,0 +1,42 @@
+from tests.conftest import make_lead
+from utils.data_handler import delete_lead, filter_leads, load_leads, save_lead, update_lead
+
+
+def test_load_leads_returns_frame_indexed_by_lead_id():
+    first = save_lead(make_lead(), "bob")
+    second = save_lead(make_lead(name="Ravi", phone="9123456780", email=""), "bob")
+
+    leads = load_leads(is_admin=True)
+
+    assert leads.index.tolist() == [first, second]
+    assert leads.loc[second, "name"] == "Ravi"
+    assert leads.loc[first, "created_by"] == "bob"
+
+
+def test_load_leads_scopes_non_admins_to_their_own_leads():
+    own = save_lead(make_lead(), "bob")
+    save_lead(make_lead(name="Ravi", phone="9123456780", email=""), "eve")
+
+    assert load_leads("bob").index.tolist() == [own]
+    assert len(load_leads("bob", is_admin=True)) == 2
+    assert load_leads("nobody").empty
+
+
+def test_update_and_delete_are_visible_to_load_leads():
+    lead_id = save_lead(make_lead(), "bob")
+
+    assert update_lead(lead_id, {"call_status": "Call taken"})
+    assert load_leads("bob").loc[lead_id, "call_status"] == "Call taken"
+
+    assert delete_lead(lead_id, deleted_by="bob")
+    assert load_leads("bob").empty
+    assert not delete_lead(lead_id, deleted_by="bob")
+
+
+def test_filter_leads_accepts_the_loaded_frame():
+    save_lead(make_lead(), "bob")
+    call_taken = save_lead(make_lead(name="Ravi", phone="9123456780", email="", call_status="Call taken"), "bob")
+
+    filtered = filter_leads(load_leads("bob"), month=3, call_status_filter=["Call taken"])
+
+    assert filtered.index.tolist() == [call_taken]
@@ -0,0 +1,67 @@
+import pytest
+
+from tests.conftest import make_lead
+from utils.data_handler import (
+    LeadConflictError, count_deleted_leads, delete_lead, get_lead, save_lead, update_lead
+)
+
+
+def test_update_with_current_version_bumps_version():
+    lead_id = save_lead(make_lead(), "bob")
+    assert get_lead(lead_id)["version"] == 1
+
+    assert update_lead(lead_id, {"call_status": "Call taken"}, expected_version=1)
+
+    lead = get_lead(lead_id)
+    assert lead["call_status"] == "Call taken"
+    assert lead["version"] == 2
+
+
+def test_update_with_stale_version_conflicts_and_changes_nothing():
+    lead_id = save_lead(make_lead(), "bob")
+    update_lead(lead_id, {"call_status": "RNP"}, expected_version=1)
+
+    with pytest.raises(LeadConflictError):
+        update_lead(lead_id, {"call_status": "Call taken"}, expected_version=1)
+
+    lead = get_lead(lead_id)
+    assert lead["call_status"] == "RNP"
+    assert lead["version"] == 2
+
+
+def test_update_without_version_always_applies():
+    lead_id = save_lead(make_lead(), "bob")
+    update_lead(lead_id, {"call_status": "RNP"})
+
+    assert update_lead(lead_id, {"call_status": "Abroad"})
+    assert get_lead(lead_id)["version"] == 3
+
+
+def test_delete_with_stale_version_conflicts_and_keeps_lead():
+    lead_id = save_lead(make_lead(), "bob")
+    update_lead(lead_id, {"call_status": "RNP"}, expected_version=1)
+
+    with pytest.raises(LeadConflictError):
+        delete_lead(lead_id, "bob", expected_version=1)
+
+    assert get_lead(lead_id) is not None
+    assert count_deleted_leads(is_admin=True) == 0
+
+
+def test_delete_with_current_version_moves_lead_to_trash():
+    lead_id = save_lead(make_lead(), "bob")
+
+    assert delete_lead(lead_id, "bob", expected_version=1)
+
+    assert get_lead(lead_id) is None
+    assert count_deleted_leads(username="bob") == 1
+
+
+def test_conditional_writes_to_a_missing_lead_conflict():
+    lead_id = save_lead(make_lead(), "bob")
+    delete_lead(lead_id, "bob")
+
+    with pytest.raises(LeadConflictError):
+        update_lead(lead_id, {"call_status": "Busy"}, expected_version=1)
+    with pytest.raises(LeadConflictError):
+        delete_lead(lead_id, "bob", expected_version=1)
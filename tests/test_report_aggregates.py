@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from tests.conftest import make_lead
+from utils.data_handler import (
+    count_leads_between, delete_lead, generate_daily_report, generate_monthly_report,
+    get_deleted_leads, rebuild_report_aggregates, restore_deleted_leads, save_lead, update_lead
+)
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def test_insert_counts_towards_reports():
+    save_lead(make_lead(created_at=_now()), "bob")
+    save_lead(make_lead(created_at=_now(), lead_temperature="Cold", call_status="Call taken"), "bob")
+    save_lead(make_lead(created_at=_now()), "carol")
+
+    report = generate_daily_report(username="bob")
+    assert report["total_leads"] == 2
+    assert report["hot_leads"] == 1
+    assert report["cold_leads"] == 1
+    assert report["calls_taken"] == 1
+    assert generate_daily_report(is_admin=True)["total_leads"] == 3
+    assert generate_daily_report(is_admin=True, selected_creator="carol")["total_leads"] == 1
+
+
+def test_update_moves_lead_between_buckets():
+    lead_id = save_lead(make_lead(created_at=_now()), "bob")
+
+    update_lead(lead_id, {"lead_status": "Working", "call_status": "Call taken"})
+
+    report = generate_daily_report(username="bob")
+    assert report["total_leads"] == 1
+    assert report["status_breakdown"] == {"Working": 1}
+    assert report["call_status_breakdown"] == {"Call taken": 1}
+
+
+def test_delete_and_restore_adjust_counts():
+    lead_id = save_lead(make_lead(), "bob")
+    save_lead(make_lead(), "bob")
+
+    delete_lead(lead_id, "bob")
+    assert generate_monthly_report(username="bob", month=3)["total_leads"] == 1
+
+    restore_deleted_leads(get_deleted_leads(username="bob").index, username="bob")
+    report = generate_monthly_report(username="bob", month=3)
+    assert report["total_leads"] == 2
+    assert report["daily_leads"] == {"2026-03-02": 2}
+
+
+def test_count_leads_between_uses_inclusive_days():
+    save_lead(make_lead(created_at="2026-03-01 23:59:59"), "bob")
+    save_lead(make_lead(created_at="2026-03-02 00:00:00"), "bob")
+    save_lead(make_lead(created_at="2026-03-03 08:00:00"), "carol")
+
+    assert count_leads_between("2026-03-01", "2026-03-02", username="bob") == 2
+    assert count_leads_between("2026-03-02", "2026-03-03", is_admin=True) == 2
+
+
+def test_incremental_aggregates_match_a_rebuild():
+    ids = [save_lead(make_lead(created_at=f"2026-03-0{day} 09:00:00"), "bob") for day in range(1, 6)]
+    update_lead(ids[0], {"lead_temperature": "Cold"})
+    update_lead(ids[1], {"created_at": "2026-04-01 09:00:00"})
+    delete_lead(ids[2], "bob")
+
+    assert rebuild_report_aggregates() == 0
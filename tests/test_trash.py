@@ -0,0 +1,130 @@
+import json
+import sqlite3
+
+from tests.conftest import make_lead
+from utils import data_handler, db
+from utils.data_handler import (
+    add_followup_note, compact_trash, count_deleted_leads, delete_lead, get_deleted_leads,
+    get_followup_notes, get_lead, init_db, purge_deleted_leads, restore_deleted_leads, save_lead
+)
+
+LEGACY_LEAD = {
+    "name": "leo", "phone": 9361580480, "email": "leo@example.com", "lead_status": "Student",
+    "call_status": "Call taken", "notes": "xvdfdbfb", "date_added": "2025-02-10 05:24:39",
+    "last_followup": "2025-02-10 06:00:00",
+    "followup_notes": "nan\n[2025-02-10 06:00:00] called back",
+    "lead_temperature": "Hot", "created_by": "Hari", "created_at": "2025-02-10 05:24:39",
+}
+
+
+def _write_legacy_trash(deleted_at="2025-02-10 08:12:59"):
+    """Create the pre-migration deleted_leads table holding one JSON row"""
+    conn = sqlite3.connect(db.DB_FILE)
+    with conn:
+        conn.execute(
+            "CREATE TABLE deleted_leads (lead_data TEXT, deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, "
+            "deleted_by TEXT, original_creator TEXT)"
+        )
+        # pandas wrote missing values as a bare NaN literal
+        conn.execute(
+            "INSERT INTO deleted_leads VALUES (?, ?, 'admin', 'Hari')",
+            (json.dumps(LEGACY_LEAD).replace('"2025-02-10 06:00:00"', "NaN", 1), deleted_at)
+        )
+    conn.close()
+
+
+def _age_trash(days):
+    with db.connection() as conn:
+        with conn:
+            conn.execute("UPDATE deleted_leads SET deleted_at = datetime('now', ?)", (f"-{days} days",))
+
+
+def test_migration_unpacks_legacy_json_and_keeps_it_in_trash():
+    _write_legacy_trash()
+    init_db()
+
+    trash = get_deleted_leads(is_admin=True)
+    assert len(trash) == 1
+    row = trash.iloc[0]
+    assert row["name"] == "leo"
+    assert row["phone"] == "9361580480"
+    assert row["last_followup"] is None
+    assert row["created_by"] == "Hari"
+    assert row["deleted_at"] == "2025-02-10 08:12:59"
+
+
+def test_retention_counts_migrated_rows_from_the_migration():
+    _write_legacy_trash()
+    init_db()
+
+    assert compact_trash() == 0
+    assert count_deleted_leads(is_admin=True) == 1
+
+
+def test_restore_of_legacy_row_moves_its_notes_into_history():
+    _write_legacy_trash()
+    init_db()
+    other_id = save_lead(make_lead(name="other"), "bob")
+    trash_id = get_deleted_leads(is_admin=True).index[0]
+
+    assert restore_deleted_leads([trash_id], is_admin=True) == 1
+
+    assert count_deleted_leads(is_admin=True) == 0
+    lead_id = other_id + 1
+    assert get_lead(lead_id)["name"] == "leo"
+    assert [note["note"] for note in get_followup_notes(lead_id)] == ["called back"]
+    assert get_followup_notes(other_id) == []
+
+
+def test_restore_keeps_the_original_lead_id():
+    lead_id = save_lead(make_lead(), "bob")
+    save_lead(make_lead(name="later", phone="1112223334", email=""), "bob")
+    delete_lead(lead_id, deleted_by="bob")
+
+    restore_deleted_leads(get_deleted_leads(username="bob").index, username="bob")
+
+    assert get_lead(lead_id)["name"] == "Asha"
+
+
+def test_restore_and_purge_only_touch_the_users_own_trash():
+    lead_id = save_lead(make_lead(), "bob")
+    delete_lead(lead_id, deleted_by="bob")
+    trash_id = get_deleted_leads(username="bob").index[0]
+
+    assert restore_deleted_leads([trash_id], username="eve") == 0
+    assert purge_deleted_leads([trash_id], username="eve") == 0
+    assert count_deleted_leads(is_admin=True) == 1
+
+
+def test_purge_deletes_trash_and_its_followup_history():
+    lead_id = save_lead(make_lead(), "bob")
+    add_followup_note(lead_id, "left a voicemail", author="bob")
+    delete_lead(lead_id, deleted_by="bob")
+    trash_id = get_deleted_leads(username="bob").index[0]
+
+    assert purge_deleted_leads([trash_id], username="bob") == 1
+
+    assert count_deleted_leads(is_admin=True) == 0
+    assert get_followup_notes(lead_id) == []
+
+
+def test_compact_trash_purges_only_rows_past_retention():
+    old_id = save_lead(make_lead(), "bob")
+    delete_lead(old_id, deleted_by="bob")
+    _age_trash(91)
+    recent_id = save_lead(make_lead(name="recent", phone="1112223334", email=""), "bob")
+    delete_lead(recent_id, deleted_by="bob")
+
+    assert compact_trash(90) == 1
+
+    assert get_deleted_leads(is_admin=True)["lead_id"].tolist() == [recent_id]
+
+
+def test_startup_does_not_purge_trash():
+    lead_id = save_lead(make_lead(), "bob")
+    delete_lead(lead_id, deleted_by="bob")
+    _age_trash(365)
+    data_handler._initialized = False
+    init_db()
+
+    assert count_deleted_leads(is_admin=True) == 1
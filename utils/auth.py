@@ -0,0 +1,311 @@
+import functools
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+import streamlit as st
+
+from utils.db import connection, migration_lock
+from utils import metrics
+from utils.metrics import set_user, timed
+
+# Seconds a validated session is trusted before the users row is checked again.
+# Deactivating a user or changing their role takes effect within this window
+# in every process, and immediately in the process that made the change.
+SESSION_TTL = 60
+
+USERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users
+    (username TEXT PRIMARY KEY,
+     password TEXT,
+     is_superuser BOOLEAN DEFAULT FALSE,
+     is_admin BOOLEAN DEFAULT FALSE,
+     is_active BOOLEAN DEFAULT TRUE,
+     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     created_by TEXT);
+"""
+
+# Session token -> {"username", "is_admin", "is_superuser", "checked_at"}
+_sessions = {}
+_sessions_lock = threading.Lock()
+_initialized = False
+
+
+def init_users():
+    """Create the users table if needed"""
+    global _initialized
+    if _initialized:
+        return
+    with migration_lock():
+        with connection() as conn:
+            conn.executescript(USERS_SCHEMA)
+    _initialized = True
+
+
+def hash_password(password):
+    """Hash a password the way it is stored in the users table"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _load_user(username):
+    """Fetch a user's row, or None"""
+    init_users()
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT username, password, is_superuser, is_admin, is_active FROM users WHERE username = ?",
+            (username,)
+        ).fetchone()
+    return dict(row) if row else None
+
+
+@timed()
+def authenticate(username, password):
+    """Check credentials and return the user row, or None"""
+    user = _load_user(username)
+    if user is None or not user["is_active"]:
+        return None
+    if not hmac.compare_digest(user["password"] or "", hash_password(password)):
+        return None
+    return user
+
+
+def create_session(user):
+    """Start a cached session for an authenticated user and return its token"""
+    token = secrets.token_urlsafe(32)
+    with _sessions_lock:
+        _sessions[token] = {
+            "username": user["username"],
+            "is_admin": bool(user["is_admin"]),
+            "is_superuser": bool(user["is_superuser"]),
+            "checked_at": time.monotonic()
+        }
+    return token
+
+
+@timed()
+def validate_session(token):
+    """Return the session for a token, rechecking the users row once SESSION_TTL has passed"""
+    if not token:
+        return None
+    now = time.monotonic()
+    with _sessions_lock:
+        session = _sessions.get(token)
+        if session is not None and now - session["checked_at"] < SESSION_TTL:
+            return session
+    if session is None:
+        return None
+
+    user = _load_user(session["username"])
+    with _sessions_lock:
+        if user is None or not user["is_active"]:
+            _sessions.pop(token, None)
+            return None
+        session = {
+            "username": user["username"],
+            "is_admin": bool(user["is_admin"]),
+            "is_superuser": bool(user["is_superuser"]),
+            "checked_at": now
+        }
+        _sessions[token] = session
+        # Drop sessions that have not been used for a while
+        for stale in [t for t, s in _sessions.items() if now - s["checked_at"] > SESSION_TTL * 60]:
+            del _sessions[stale]
+    return session
+
+
+def invalidate_user_sessions(username):
+    """Force every cached session of a user to be rechecked on its next request"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            if session["username"] == username:
+                session["checked_at"] = float("-inf")
+
+
+def logout():
+    """End the current user's session"""
+    token = st.session_state.get("auth_token")
+    with _sessions_lock:
+        _sessions.pop(token, None)
+    st.session_state.clear()
+
+
+def require_login(func):
+    """Run the page only for a logged-in user, otherwise show the login page"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Script threads are reused across sessions, so reset who timings belong to
+        set_user(st.session_state.get("username"))
+        session = validate_session(st.session_state.get("auth_token"))
+        if session is None:
+            set_user(None)
+            st.session_state.pop("auth_token", None)
+            show_login_page()
+            return None
+        set_user(session["username"])
+        st.session_state.username = session["username"]
+        st.session_state.is_admin = session["is_admin"]
+        st.session_state.is_superuser = session["is_superuser"]
+        return func(*args, **kwargs)
+    return wrapper
+
+
+@timed()
+def show_login_page():
+    st.header("Login")
+
+    with st.form("login_form"):
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        submitted = st.form_submit_button("Login")
+
+        if submitted:
+            user = authenticate(username, password)
+            if user is None:
+                st.error("Invalid username or password")
+            else:
+                st.session_state.auth_token = create_session(user)
+                st.rerun()
+
+
+def list_users():
+    """Load all users without their password hashes"""
+    init_users()
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT username, is_superuser, is_admin, is_active, created_at, created_by "
+            "FROM users ORDER BY username"
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def create_user(username, password, is_admin=False, created_by=None):
+    """Add a user; return False if the username is taken"""
+    init_users()
+    try:
+        with connection() as conn:
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (username, password, is_admin, created_by) VALUES (?, ?, ?, ?)",
+                    (username, hash_password(password), bool(is_admin), created_by)
+                )
+        return True
+    except Exception as e:
+        print(f"Error creating user: {str(e)}")
+        return False
+
+
+def update_user(username, **fields):
+    """Change a user's is_admin / is_active flags or password"""
+    allowed = {"is_admin", "is_active", "password"}
+    fields = {k: v for k, v in fields.items() if k in allowed}
+    if "password" in fields:
+        fields["password"] = hash_password(fields["password"])
+    if not fields:
+        return False
+    init_users()
+    with connection() as conn:
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE users SET {', '.join(f'{k} = ?' for k in fields)} WHERE username = ?",
+                (*fields.values(), username)
+            )
+    invalidate_user_sessions(username)
+    return cursor.rowcount == 1
+
+
+@timed()
+def show_admin_console():
+    st.header("Admin Console")
+
+    tab1, tab2, tab3 = st.tabs(["Users", "Cache", "Performance"])
+
+    with tab1:
+        users = list_users()
+        st.dataframe(users, use_container_width=True, hide_index=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Add User")
+            with st.form("add_user_form", clear_on_submit=True):
+                new_username = st.text_input("Username")
+                new_password = st.text_input("Password", type="password")
+                new_is_admin = st.checkbox("Admin")
+                if st.form_submit_button("Create User"):
+                    if not new_username or not new_password:
+                        st.error("Username and password are required")
+                    elif create_user(new_username, new_password, new_is_admin, st.session_state.username):
+                        st.success(f"User {new_username} created")
+                    else:
+                        st.error("Could not create user. The username may already exist.")
+
+        with col2:
+            st.subheader("Manage User")
+            usernames = [u["username"] for u in users if u["username"] != st.session_state.username]
+            if usernames:
+                with st.form("manage_user_form"):
+                    selected = st.selectbox("User", usernames)
+                    current = next(u for u in users if u["username"] == selected)
+                    is_active = st.checkbox("Active", value=bool(current["is_active"]))
+                    is_admin = st.checkbox("Admin", value=bool(current["is_admin"]))
+                    new_password = st.text_input("New Password (optional)", type="password")
+                    if st.form_submit_button("Save Changes"):
+                        changes = {"is_active": is_active, "is_admin": is_admin}
+                        if new_password:
+                            changes["password"] = new_password
+                        update_user(selected, **changes)
+                        st.success(f"User {selected} updated")
+                        st.rerun()
+            else:
+                st.info("No other users yet")
+
+    with tab2:
+        # Imported here so the login path does not load the data stack
+        from utils.data_handler import get_cache_stats
+
+        stats = get_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Lead Cache Hits", stats["hits"])
+        with col2:
+            st.metric("Lead Cache Misses", stats["misses"])
+        with col3:
+            st.metric("Hit Rate", f"{stats['hits'] / lookups:.0%}" if lookups else "n/a")
+        with col4:
+            st.metric("Cached Rows", stats["rows"])
+        st.caption(f"Data version {stats['version']}, {stats['invalidations']} invalidations")
+
+    with tab3:
+        show_performance_panel()
+
+
+def show_performance_panel():
+    st.caption("Timings recorded by this server process since it started or was last reset")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        view = st.radio("Group by", ["Operation", "Operation and user"], horizontal=True)
+    with col2:
+        selected_user = st.selectbox("User", ["All users"] + metrics.users())
+
+    stats = metrics.snapshot(
+        by_user=view == "Operation and user",
+        username=None if selected_user == "All users" else selected_user
+    )
+    if stats:
+        st.dataframe(stats, use_container_width=True, hide_index=True)
+    else:
+        st.info("No timings recorded yet")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Export to SQLite"):
+            exported = metrics.export_sqlite()
+            st.success(f"Exported {exported} histograms to {metrics.METRICS_DB}")
+    with col2:
+        if st.button("Reset Timings"):
+            metrics.reset()
+            st.rerun()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import time
+
+import pandas as pd
+
+from utils.data_handler import (
+    CALL_STATUSES, DATETIME_COLUMNS, LEAD_COLUMNS, LEAD_STATUSES, LEAD_TEMPERATURES,
+    find_existing_contacts, normalize_phone, save_leads_bulk
+)
+from utils.metrics import timed
+
+CHUNK_SIZE = 5000
+REQUIRED_COLUMNS = ["name", "phone"]
+# Columns an upload may set; imported leads always belong to the importing user
+IMPORT_COLUMNS = [c for c in LEAD_COLUMNS if c != "created_by"]
+ENUM_COLUMNS = {
+    "lead_status": LEAD_STATUSES,
+    "call_status": CALL_STATUSES,
+    "lead_temperature": LEAD_TEMPERATURES,
+}
+# Stored date formats; followups are compared by day, so next_followup keeps no time
+DATE_FORMATS = {column: "%Y-%m-%d %H:%M:%S" for column in DATETIME_COLUMNS}
+DATE_FORMATS["next_followup"] = "%Y-%m-%d"
+# Rejected rows kept in the report for display
+MAX_REJECTED_SAMPLES = 100
+
+
+def _read_csv_chunks(source, chunk_size):
+    yield from pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+
+def _read_xlsx_chunks(source, chunk_size):
+    # Imported here so pages that never import a workbook do not pay for it
+    from openpyxl import load_workbook
+
+    # read_only mode streams rows instead of loading the whole sheet
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value) if value is not None else "" for value in next(rows, [])]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=header, dtype=str)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, dtype=str)
+    finally:
+        workbook.close()
+
+
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    """Yield a CSV or XLSX lead file as DataFrame chunks of strings"""
+    file_name = getattr(source, "name", None) or str(source)
+    if os.path.splitext(file_name)[1].lower() in (".xlsx", ".xlsm"):
+        return _read_xlsx_chunks(source, chunk_size)
+    return _read_csv_chunks(source, chunk_size)
+
+
+def _normalize(chunk):
+    """Map uploaded headers onto lead columns and tidy the values"""
+    chunk = chunk.rename(columns=lambda c: str(c).strip().lower().replace(" ", "_"))
+    chunk = chunk.reindex(columns=IMPORT_COLUMNS).fillna("")
+    for column in IMPORT_COLUMNS:
+        chunk[column] = chunk[column].astype(str).str.strip()
+    chunk["phone"] = chunk["phone"].map(normalize_phone)
+    chunk["email"] = chunk["email"].str.lower()
+    # Match enum values regardless of case, e.g. "hot" -> "Hot"
+    for column, allowed in ENUM_COLUMNS.items():
+        lookup = {value.lower(): value for value in allowed}
+        lowered = chunk[column].str.lower()
+        chunk[column] = lowered.map(lookup).fillna(chunk[column])
+    chunk["details_shared"] = chunk["details_shared"].str.lower().isin(["1", "true", "yes", "y"])
+    # Dates must be ISO (2025-03-10, optionally with a time) so day/month order is never guessed.
+    # Unparseable values are left as they are for _validate to reject
+    for column, date_format in DATE_FORMATS.items():
+        parsed = pd.to_datetime(chunk[column].where(chunk[column] != ""), format="ISO8601", errors="coerce")
+        chunk[column] = parsed.dt.strftime(date_format).where(parsed.notna(), chunk[column])
+    return chunk
+
+
+def _validate(chunk):
+    """Return a Series with the rejection reason per row, empty for valid rows"""
+    reasons = pd.Series("", index=chunk.index)
+    for column in REQUIRED_COLUMNS:
+        reasons = reasons.mask((reasons == "") & (chunk[column] == ""), f"missing {column}")
+    for column, allowed in ENUM_COLUMNS.items():
+        invalid = (chunk[column] != "") & ~chunk[column].isin(allowed)
+        reasons = reasons.mask((reasons == "") & invalid, f"invalid {column}")
+    for column, date_format in DATE_FORMATS.items():
+        unparsed = pd.to_datetime(chunk[column], format=date_format, errors="coerce").isna()
+        reasons = reasons.mask((reasons == "") & (chunk[column] != "") & unparsed, f"invalid {column}")
+    return reasons
+
+
+@timed()
+def import_leads(source, username, chunk_size=CHUNK_SIZE):
+    """Import leads from a CSV or XLSX file in batches, owned by username.
+
+    Rows are validated per chunk, checked against existing leads (and earlier
+    rows of the same file) by phone and email, and each chunk is committed in
+    one transaction. Returns a report with accepted, rejected and duplicate
+    counts and the throughput.
+    """
+    started = time.perf_counter()
+    report = {"rows": 0, "accepted": 0, "rejected": 0, "duplicates": 0, "rejected_rows": []}
+    seen_phones, seen_emails = set(), set()
+
+    for chunk in read_chunks(source, chunk_size):
+        first_row = report["rows"] + 2  # 1-based, after the header row
+        report["rows"] += len(chunk)
+        chunk = _normalize(chunk.reset_index(drop=True))
+
+        reasons = _validate(chunk)
+        rejected = reasons != ""
+        report["rejected"] += int(rejected.sum())
+        for position, reason in reasons[rejected].head(
+                MAX_REJECTED_SAMPLES - len(report["rejected_rows"])).items():
+            report["rejected_rows"].append({"row": first_row + position, "reason": reason})
+        chunk = chunk[~rejected]
+
+        has_email = chunk["email"] != ""
+        phones = set(chunk["phone"].unique())
+        emails = set(chunk.loc[has_email, "email"].unique())
+        existing_phones, existing_emails = find_existing_contacts(phones, emails)
+        # Only the values present in this chunk matter for the membership tests
+        known_phones = existing_phones | (seen_phones & phones)
+        known_emails = existing_emails | (seen_emails & emails)
+        duplicate = (
+            chunk["phone"].isin(known_phones)
+            | chunk["phone"].duplicated()
+            | (has_email & chunk["email"].isin(known_emails))
+            | (has_email & chunk["email"].duplicated())
+        )
+        report["duplicates"] += int(duplicate.sum())
+        chunk = chunk[~duplicate]
+
+        seen_phones.update(chunk["phone"])
+        seen_emails.update(chunk.loc[chunk["email"] != "", "email"])
+        records = chunk.replace({"": None}).to_dict("records")
+        report["accepted"] += save_leads_bulk(records, username)
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["rows_per_sec"] = round(report["rows"] / report["seconds"], 1) if report["seconds"] else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import leads from a CSV or XLSX file")
+    parser.add_argument("path")
+    parser.add_argument("--user", required=True, help="username recorded as the creator")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print(json.dumps(import_leads(args.path, args.user, chunk_size=args.chunk_size), indent=2))
@@ -0,0 +1,1309 @@
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from utils.db import connection, data_path, migration_lock
+from utils.metrics import timed
+
+DATA_FILE = data_path("leads_data.csv")
+
+# Writable lead columns in legacy leads_data.csv order. Followup notes are kept in
+# followup_history; leads.followup_notes only holds legacy text until it is moved there
+LEAD_COLUMNS = [
+    "name", "phone", "email", "lead_status", "call_status", "notes",
+    "date_added", "last_followup", "lead_temperature",
+    "created_by", "created_at", "details_shared", "next_followup",
+    "followup_status"
+]
+
+# Allowed values for the lead enum columns, as offered in the lead forms
+LEAD_STATUSES = ["Student", "Working", "Unemployed", "Fresher"]
+CALL_STATUSES = ["Call taken", "Busy", "RNP", "Out of service", "Abroad", "Cut the call"]
+LEAD_TEMPERATURES = ["Hot", "Cold"]
+
+# Lead frames carry these parsed once, so filters and pages never re-parse strings
+DATETIME_COLUMNS = ["created_at", "date_added", "last_followup", "next_followup"]
+CATEGORY_COLUMNS = ["lead_status", "call_status", "lead_temperature", "followup_status", "created_by"]
+
+# Typed lead columns kept in deleted_leads; the creator lives in original_creator
+TRASH_COLUMNS = ["lead_id"] + [c for c in LEAD_COLUMNS if c != "created_by"] + ["followup_notes"]
+
+# Deleted leads older than this are purged by compact_trash
+TRASH_RETENTION_DAYS = 90
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     name TEXT,
+     phone TEXT,
+     email TEXT,
+     lead_status TEXT,
+     call_status TEXT,
+     notes TEXT,
+     date_added TEXT,
+     last_followup TEXT,
+     followup_notes TEXT,
+     lead_temperature TEXT,
+     created_by TEXT,
+     created_at TEXT,
+     details_shared INTEGER DEFAULT 0,
+     next_followup TEXT,
+     followup_status TEXT,
+     version INTEGER NOT NULL DEFAULT 1);
+CREATE INDEX IF NOT EXISTS idx_leads_created_by ON leads(created_by);
+CREATE INDEX IF NOT EXISTS idx_leads_created_at ON leads(created_at);
+DROP INDEX IF EXISTS idx_leads_next_followup;
+CREATE INDEX IF NOT EXISTS idx_leads_followup_due ON leads(next_followup, created_by)
+    WHERE followup_status IS NOT 'Completed' AND next_followup IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_leads_phone ON leads(phone);
+CREATE INDEX IF NOT EXISTS idx_leads_email ON leads(lower(email));
+CREATE TABLE IF NOT EXISTS deleted_leads
+    (lead_data TEXT,
+     deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+     deleted_by TEXT,
+     original_creator TEXT);
+CREATE INDEX IF NOT EXISTS idx_deleted_leads_creator ON deleted_leads(original_creator, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_deleted_leads_deleted_by ON deleted_leads(deleted_by, deleted_at);
+CREATE INDEX IF NOT EXISTS idx_deleted_leads_deleted_at ON deleted_leads(deleted_at);
+CREATE TABLE IF NOT EXISTS followup_history
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     lead_id INTEGER NOT NULL,
+     created_at TEXT,
+     author TEXT,
+     status TEXT,
+     note TEXT);
+CREATE INDEX IF NOT EXISTS idx_followup_history_lead ON followup_history(lead_id, id);
+CREATE TABLE IF NOT EXISTS store_meta
+    (key TEXT PRIMARY KEY,
+     value TEXT);
+"""
+
+# Lead counts per (creator, day, bucket), kept current by triggers on the leads table
+AGGREGATE_KEY = "COALESCE({p}.created_by, ''), COALESCE(date({p}.created_at), ''), " \
+    "COALESCE({p}.lead_status, ''), COALESCE({p}.call_status, ''), " \
+    "COALESCE({p}.lead_temperature, ''), COALESCE({p}.details_shared, 0)"
+
+REPORT_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS lead_daily_stats
+    (created_by TEXT NOT NULL,
+     day TEXT NOT NULL,
+     lead_status TEXT NOT NULL,
+     call_status TEXT NOT NULL,
+     temperature TEXT NOT NULL,
+     details_shared INTEGER NOT NULL,
+     lead_count INTEGER NOT NULL DEFAULT 0,
+     PRIMARY KEY (created_by, day, lead_status, call_status, temperature, details_shared));
+CREATE INDEX IF NOT EXISTS idx_lead_daily_stats_day ON lead_daily_stats(day);
+CREATE TRIGGER IF NOT EXISTS leads_stats_insert AFTER INSERT ON leads
+BEGIN
+    INSERT INTO lead_daily_stats VALUES ({AGGREGATE_KEY.format(p="NEW")}, 1)
+    ON CONFLICT DO UPDATE SET lead_count = lead_count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS leads_stats_delete AFTER DELETE ON leads
+BEGIN
+    UPDATE lead_daily_stats SET lead_count = lead_count - 1
+    WHERE (created_by, day, lead_status, call_status, temperature, details_shared)
+        = ({AGGREGATE_KEY.format(p="OLD")});
+END;
+CREATE TRIGGER IF NOT EXISTS leads_stats_update
+AFTER UPDATE OF created_by, created_at, lead_status, call_status, lead_temperature, details_shared ON leads
+BEGIN
+    UPDATE lead_daily_stats SET lead_count = lead_count - 1
+    WHERE (created_by, day, lead_status, call_status, temperature, details_shared)
+        = ({AGGREGATE_KEY.format(p="OLD")});
+    INSERT INTO lead_daily_stats VALUES ({AGGREGATE_KEY.format(p="NEW")}, 1)
+    ON CONFLICT DO UPDATE SET lead_count = lead_count + 1;
+END;
+"""
+
+# Full-text index over the searchable lead fields; rowid is the lead id
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5
+    (name, phone, email, notes, followup_notes, prefix='2 3 4');
+CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads
+BEGIN
+    INSERT INTO leads_fts (rowid, name, phone, email, notes, followup_notes)
+    VALUES (NEW.id, NEW.name, NEW.phone, NEW.email, NEW.notes,
+            (SELECT group_concat(note, ' ') FROM followup_history WHERE lead_id = NEW.id));
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads
+BEGIN
+    DELETE FROM leads_fts WHERE rowid = OLD.id;
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF name, phone, email, notes ON leads
+BEGIN
+    UPDATE leads_fts SET name = NEW.name, phone = NEW.phone, email = NEW.email, notes = NEW.notes
+    WHERE rowid = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_followup AFTER INSERT ON followup_history
+BEGIN
+    UPDATE leads_fts SET followup_notes = COALESCE(followup_notes || ' ', '') || NEW.note
+    WHERE rowid = NEW.lead_id;
+END;
+"""
+
+_initialized = False
+# False when this SQLite build lacks FTS5; search then falls back to LIKE
+_fts_available = True
+
+# Process-wide cache of the parsed lead table, keyed by the store's data version
+_cache_lock = threading.Lock()
+_cache = {"version": None, "frame": None}
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+# Team analytics for the current data version, keyed by (window_days, trend_days, today)
+_analytics_cache = {"version": None, "results": {}}
+
+
+class LeadConflictError(Exception):
+    """Raised when a lead was changed or removed since it was loaded"""
+
+
+def init_db():
+    """Create the lead tables and import the legacy CSV once"""
+    global _initialized
+    if _initialized:
+        return
+    with migration_lock():
+        _migrate()
+    _initialized = True
+
+
+def _migrate():
+    """Bring the schema up to date and run the one-time data migrations"""
+    with connection() as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.executescript(SCHEMA)
+        _add_missing_column(conn, "leads", "version", "INTEGER NOT NULL DEFAULT 1")
+        for column in TRASH_COLUMNS:
+            _add_missing_column(
+                conn, "deleted_leads", column,
+                "INTEGER" if column in ("lead_id", "details_shared") else "TEXT"
+            )
+        _add_missing_column(conn, "deleted_leads", "migrated_at", "TEXT")
+        conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('data_version', 0)")
+        conn.commit()
+        conn.executescript(REPORT_SCHEMA)
+        if conn.execute(
+            "SELECT 1 FROM store_meta WHERE key = 'aggregates_built'"
+        ).fetchone() is None:
+            _rebuild_aggregates(conn)
+        _init_search(conn)
+        imported = conn.execute(
+            "SELECT value FROM store_meta WHERE key = 'csv_imported'"
+        ).fetchone()
+    if imported is None and os.path.exists(DATA_FILE):
+        import_csv(DATA_FILE)
+    with connection() as conn:
+        _migrate_followup_notes(conn)
+        _migrate_trash_rows(conn)
+        _migrate_phone_format(conn)
+
+
+# Characters dropped from phone numbers before they are stored or compared
+PHONE_NOISE = re.compile(r"[^\d+]")
+
+# Legacy followup_notes entries look like "[2025-02-10 03:52:05] note text"
+LEGACY_NOTE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]\s?(.*)$")
+
+
+def _split_followup_notes(text, fallback_time=None):
+    """Parse a legacy newline-joined followup_notes blob into (timestamp, note) pairs"""
+    notes = []
+    for line in str(text).splitlines():
+        line = line.strip()
+        # Older writes stringified a missing value into a literal "nan" line
+        if not line or line.lower() == "nan":
+            continue
+        match = LEGACY_NOTE.match(line)
+        if match:
+            notes.append((match.group(1), match.group(2)))
+        elif notes:
+            notes[-1] = (notes[-1][0], f"{notes[-1][1]}\n{line}")
+        else:
+            notes.append((fallback_time, line))
+    return notes
+
+
+def _move_followup_notes(conn, where="1", params=()):
+    """Turn legacy followup_notes text on leads into followup_history rows, inside the caller's transaction.
+
+    where narrows the leads to look at, e.g. to the ones just restored from trash.
+    """
+    rows = conn.execute(
+        "SELECT id, followup_notes, last_followup, created_by FROM leads "
+        f"WHERE ({where}) AND followup_notes IS NOT NULL AND followup_notes != ''",
+        params
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO followup_history (lead_id, created_at, author, note) VALUES (?, ?, ?, ?)",
+        [
+            (row["id"], created_at, row["created_by"], note)
+            for row in rows
+            for created_at, note in _split_followup_notes(row["followup_notes"], row["last_followup"])
+        ]
+    )
+    conn.execute(f"UPDATE leads SET followup_notes = NULL WHERE ({where}) AND followup_notes IS NOT NULL", params)
+    return len(rows)
+
+
+def _migrate_followup_notes(conn):
+    """Move legacy followup_notes blobs into followup_history rows, once"""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute(
+            "SELECT 1 FROM store_meta WHERE key = 'followup_notes_migrated'"
+        ).fetchone():
+            return
+        _move_followup_notes(conn)
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('followup_notes_migrated', ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+        )
+        _bump_data_version(conn)
+
+
+def _migrate_trash_rows(conn):
+    """Unpack legacy JSON lead_data blobs in deleted_leads into typed columns"""
+    rows = conn.execute(
+        "SELECT rowid, lead_data FROM deleted_leads WHERE lead_data IS NOT NULL"
+    ).fetchall()
+    if not rows:
+        return
+    updates = []
+    for row in rows:
+        # Legacy rows were written with pandas' NaN literal, which json reads as
+        # float("nan"); _column_value stores those as NULL
+        lead = json.loads(row["lead_data"])
+        updates.append((*(_column_value(c, lead.get(c)) for c in TRASH_COLUMNS), row["rowid"]))
+    with conn:
+        # Retention counts from the migration, so rows deleted long ago stay visible in the trash for a while
+        conn.executemany(
+            f"UPDATE deleted_leads SET {', '.join(f'{c} = ?' for c in TRASH_COLUMNS)}, lead_data = NULL, "
+            "migrated_at = datetime('now') "
+            "WHERE rowid = ? AND lead_data IS NOT NULL",
+            updates
+        )
+
+
+def _migrate_phone_format(conn):
+    """Strip spaces and punctuation from phones stored before they were normalized, once"""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM store_meta WHERE key = 'phones_normalized'").fetchone():
+            return
+        rows = conn.execute("SELECT id, phone FROM leads WHERE phone GLOB '*[^0-9+]*'").fetchall()
+        conn.executemany(
+            "UPDATE leads SET phone = ? WHERE id = ?",
+            [(normalize_phone(row["phone"]), row["id"]) for row in rows]
+        )
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('phones_normalized', ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+        )
+        if rows:
+            _bump_data_version(conn)
+
+
+def _init_search(conn):
+    """Create the full-text index and fill it from existing leads once"""
+    global _fts_available
+    try:
+        conn.executescript(SEARCH_SCHEMA)
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable, using LIKE search: {str(e)}")
+        _fts_available = False
+        return
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM store_meta WHERE key = 'search_index_built'").fetchone():
+            return
+        conn.execute("DELETE FROM leads_fts")
+        conn.execute(
+            "INSERT INTO leads_fts (rowid, name, phone, email, notes, followup_notes) "
+            "SELECT id, name, phone, email, notes, "
+            "(SELECT group_concat(note, ' ') FROM followup_history WHERE lead_id = leads.id) FROM leads"
+        )
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('search_index_built', ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+        )
+
+
+def _add_missing_column(conn, table, column, definition):
+    """Add a column to a table created by an older version of the app"""
+    columns = [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.commit()
+
+
+def _clean_value(value):
+    """Convert pandas missing values to None for SQLite"""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def normalize_phone(value):
+    """Keep only the digits and + of a phone number, so every write path stores one format"""
+    if value is None:
+        return None
+    return PHONE_NOISE.sub("", str(value))
+
+
+def _column_value(column, value):
+    """Normalize a single lead field for storage"""
+    value = _clean_value(value)
+    if column == "details_shared":
+        return 1 if str(value).lower() in ("1", "true") else 0
+    if column == "phone":
+        return normalize_phone(value)
+    return value
+
+
+def _lead_row(lead_data):
+    """Build a row tuple in LEAD_COLUMNS order from a lead dict"""
+    return tuple(_column_value(column, lead_data.get(column)) for column in LEAD_COLUMNS)
+
+
+@timed()
+def import_csv(csv_path=DATA_FILE):
+    """One-shot import of the legacy leads CSV into the lead store"""
+    columns = LEAD_COLUMNS + ["followup_notes"]
+    df = pd.read_csv(csv_path, dtype={"phone": str})
+    df = df.reindex(columns=columns)
+    # Legacy rows predate created_at; fall back to when they were added
+    df["created_at"] = df["created_at"].fillna(df["date_added"])
+    rows = [
+        (*_lead_row(record), _clean_value(record["followup_notes"]))
+        for record in df.to_dict("records")
+    ]
+
+    placeholders = ", ".join("?" for _ in columns)
+    with connection() as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute(
+                "SELECT 1 FROM store_meta WHERE key = 'csv_imported'"
+            ).fetchone():
+                return 0
+            conn.executemany(
+                f"INSERT INTO leads ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+            _move_followup_notes(conn)
+            conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('csv_imported', ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+            )
+            _bump_data_version(conn)
+    _invalidate_cache()
+    return len(rows)
+
+
+def _bump_data_version(conn):
+    """Record a change to the lead table inside the caller's transaction"""
+    conn.execute(
+        "UPDATE store_meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'data_version'"
+    )
+
+
+def get_data_version():
+    """Return the lead store's modification counter"""
+    init_db()
+    with connection() as conn:
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'data_version'").fetchone()
+    return int(row["value"]) if row else 0
+
+
+def _invalidate_cache():
+    """Drop the cached lead frame after a write"""
+    with _cache_lock:
+        _cache["version"] = None
+        _cache["frame"] = None
+        _cache_stats["invalidations"] += 1
+
+
+def _cached_leads():
+    """Return the full parsed lead frame, reloading only when the store changed.
+
+    The returned frame is shared between callers and must not be modified.
+    """
+    version = get_data_version()
+    with _cache_lock:
+        if _cache["frame"] is not None and _cache["version"] == version:
+            _cache_stats["hits"] += 1
+            return _cache["frame"]
+    frame = _query_leads("ORDER BY id")
+    with _cache_lock:
+        _cache_stats["misses"] += 1
+        _cache["version"] = version
+        _cache["frame"] = frame
+    return frame
+
+
+def get_cache_stats():
+    """Return hit/miss counters for the lead cache"""
+    with _cache_lock:
+        frame = _cache["frame"]
+        return {
+            **_cache_stats,
+            "version": _cache["version"],
+            "rows": 0 if frame is None else len(frame)
+        }
+
+
+def _user_leads(leads, username=None, is_admin=False):
+    """Narrow a lead frame to the rows a user may see"""
+    if is_admin:
+        return leads
+    return leads[leads["created_by"] == username]
+
+
+def _typed_frame(df):
+    """Convert a raw lead frame to datetime and categorical columns"""
+    for column in DATETIME_COLUMNS:
+        df[column] = pd.to_datetime(df[column], format="ISO8601", errors="coerce")
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+    df["details_shared"] = df["details_shared"].fillna(0).astype(bool)
+    return df
+
+
+# A lead's followup history as newline-joined "[time] note" lines, the legacy followup_notes format
+FOLLOWUP_NOTES_TEXT = """
+    (SELECT group_concat(line, char(10)) FROM
+        (SELECT CASE WHEN created_at IS NULL THEN note ELSE '[' || created_at || '] ' || note END AS line
+         FROM followup_history WHERE lead_id = leads.id ORDER BY id)) AS followup_notes
+"""
+
+
+@timed()
+def _query_leads(where="", params=(), typed=True, with_notes=False):
+    """Run a SELECT against the leads table and return a DataFrame indexed by lead id.
+
+    with_notes adds a followup_notes column holding the lead's followup history.
+    """
+    columns = f"id, {', '.join(LEAD_COLUMNS)}, version"
+    if with_notes:
+        columns += f", {FOLLOWUP_NOTES_TEXT}"
+    init_db()
+    with connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT {columns} FROM leads {where}",
+            conn,
+            params=params,
+            index_col="id"
+        )
+    if typed:
+        return _typed_frame(df)
+    df["details_shared"] = df["details_shared"].fillna(0).astype(bool)
+    return df
+
+
+@timed()
+def save_lead(lead_data, username):
+    """Save a new lead and return its id"""
+    init_db()
+    lead_data = dict(lead_data)
+    lead_data.setdefault("created_by", username)
+    lead_data.setdefault("created_at", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    placeholders = ", ".join("?" for _ in LEAD_COLUMNS)
+    with connection() as conn:
+        with conn:
+            cursor = conn.execute(
+                f"INSERT INTO leads ({', '.join(LEAD_COLUMNS)}) VALUES ({placeholders})",
+                _lead_row(lead_data)
+            )
+            _bump_data_version(conn)
+    _invalidate_cache()
+    return cursor.lastrowid
+
+
+@timed()
+def save_leads_bulk(leads, username):
+    """Insert many leads in a single transaction and return how many were saved"""
+    init_db()
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    rows = []
+    for lead_data in leads:
+        lead_data = dict(lead_data)
+        if not lead_data.get("created_by"):
+            lead_data["created_by"] = username
+        if not lead_data.get("created_at"):
+            lead_data["created_at"] = now
+        if not lead_data.get("date_added"):
+            lead_data["date_added"] = lead_data["created_at"]
+        rows.append(_lead_row(lead_data))
+    if not rows:
+        return 0
+    placeholders = ", ".join("?" for _ in LEAD_COLUMNS)
+    with connection() as conn:
+        with conn:
+            conn.executemany(
+                f"INSERT INTO leads ({', '.join(LEAD_COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+            _bump_data_version(conn)
+    _invalidate_cache()
+    return len(rows)
+
+
+@timed()
+def find_existing_contacts(phones=(), emails=()):
+    """Return the subset of (normalized) phones and (lowercased) emails that already belong to a lead"""
+    found = {"phone": set(), "lower(email)": set()}
+    phones = {normalize_phone(phone) for phone in phones}
+    init_db()
+    with connection() as conn:
+        for column, values in (("phone", list(phones)), ("lower(email)", [e.lower() for e in emails])):
+            # Stay under SQLite's bound parameter limit
+            for start in range(0, len(values), 500):
+                batch = values[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT DISTINCT {column} FROM leads WHERE {column} IN ({', '.join('?' for _ in batch)})",
+                    batch
+                ).fetchall()
+                found[column].update(row[0] for row in rows)
+    return found["phone"], found["lower(email)"]
+
+
+@timed()
+def load_leads(username=None, is_admin=False):
+    """Load leads visible to the given user"""
+    return _user_leads(_cached_leads(), username, is_admin).copy()
+
+
+@timed()
+def filter_leads(leads, month=None, status_filter=None, call_status_filter=None, creators=None):
+    """Filter a typed lead frame by creation month, lead status, call status and creator"""
+    mask = pd.Series(True, index=leads.index)
+    if month and month != "All":
+        mask &= leads["created_at"].dt.month == int(month)
+    if status_filter:
+        mask &= leads["lead_status"].isin(status_filter)
+    if call_status_filter:
+        mask &= leads["call_status"].isin(call_status_filter)
+    if creators:
+        mask &= leads["created_by"].isin(creators)
+    return leads[mask]
+
+
+def _search_terms(search):
+    """Split a search box query into index tokens"""
+    return re.findall(r"\w+", str(search or "").lower())
+
+
+def _lead_filter_clause(username=None, is_admin=False, month=None, status_filter=None,
+                        call_status_filter=None, creators=None, search=None, after_id=None):
+    """Build a FROM/WHERE suffix for the View Leads filters and search"""
+    join = ""
+    clauses = []
+    params = []
+    terms = _search_terms(search)
+    if terms and _fts_available:
+        # Every term must match, each as a prefix, ranked by bm25
+        join = "JOIN (SELECT rowid AS fts_id, rank FROM leads_fts WHERE leads_fts MATCH ?) ON fts_id = leads.id"
+        params.append(" ".join(f'"{term}"*' for term in terms))
+    elif terms:
+        for term in terms:
+            clauses.append(
+                "(name LIKE ? OR phone LIKE ? OR email LIKE ? OR notes LIKE ? OR "
+                "id IN (SELECT lead_id FROM followup_history WHERE note LIKE ?))"
+            )
+            params.extend([f"%{term}%"] * 5)
+    if not is_admin:
+        clauses.append("created_by = ?")
+        params.append(username)
+    elif creators:
+        clauses.append(f"created_by IN ({', '.join('?' for _ in creators)})")
+        params.extend(creators)
+    if month and month != "All":
+        clauses.append("CAST(strftime('%m', created_at) AS INTEGER) = ?")
+        params.append(int(month))
+    if status_filter:
+        clauses.append(f"lead_status IN ({', '.join('?' for _ in status_filter)})")
+        params.extend(status_filter)
+    if call_status_filter:
+        clauses.append(f"call_status IN ({', '.join('?' for _ in call_status_filter)})")
+        params.extend(call_status_filter)
+    if after_id is not None:
+        clauses.append("leads.id > ?")
+        params.append(int(after_id))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"{join} {where}", params
+
+
+def _lead_order(filters):
+    """Order search results by relevance, everything else most recent first"""
+    if _search_terms(filters.get("search")) and _fts_available:
+        return "ORDER BY rank, id DESC"
+    return "ORDER BY created_at DESC, id DESC"
+
+
+@timed()
+def count_leads(**filters):
+    """Count leads matching the View Leads filters"""
+    where, params = _lead_filter_clause(**filters)
+    init_db()
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM leads {where}", params).fetchone()[0]
+
+
+@timed()
+def load_leads_page(page=1, page_size=25, **filters):
+    """Load one page of filtered leads, best search match or most recent first"""
+    init_db()
+    where, params = _lead_filter_clause(**filters)
+    offset = (max(int(page), 1) - 1) * int(page_size)
+    return _query_leads(
+        f"{where} {_lead_order(filters)} LIMIT ? OFFSET ?",
+        (*params, int(page_size), offset)
+    )
+
+
+@timed()
+def load_filtered_leads(**filters):
+    """Load every lead matching the View Leads filters"""
+    init_db()
+    where, params = _lead_filter_clause(**filters)
+    return _query_leads(f"{where} {_lead_order(filters)}", params)
+
+
+def iter_filtered_leads(chunk_size=5000, with_notes=False, **filters):
+    """Yield every lead matching the View Leads filters in id order, one chunk at a time.
+
+    Each chunk is a separate keyset query, so exports of any size stay within
+    one chunk of memory. with_notes adds each lead's followup history.
+    """
+    init_db()
+    last_id = 0
+    while True:
+        where, params = _lead_filter_clause(**filters, after_id=last_id)
+        chunk = _query_leads(
+            f"{where} ORDER BY leads.id LIMIT ?", (*params, int(chunk_size)), with_notes=with_notes
+        )
+        if chunk.empty:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = int(chunk.index[-1])
+
+
+@timed()
+def search_leads(search, limit=20, **filters):
+    """Return the best matching leads for a search query, combined with the View Leads filters"""
+    return load_leads_page(page=1, page_size=limit, search=search, **filters)
+
+
+def _date_range_clause(start_date, end_date, username=None, is_admin=False):
+    """Build a WHERE clause selecting leads created between two dates, inclusive"""
+    clauses = ["created_at >= ?", "created_at < date(?, '+1 day')"]
+    params = [str(start_date), str(end_date)]
+    if not is_admin:
+        clauses.append("created_by = ?")
+        params.append(username)
+    return " AND ".join(clauses), params
+
+
+@timed()
+def count_leads_between(start_date, end_date, username=None, is_admin=False):
+    """Count leads created between two dates using the report aggregates"""
+    clauses = ["day >= ?", "day <= ?"]
+    params = [str(start_date), str(end_date)]
+    if not is_admin:
+        clauses.append("created_by = ?")
+        params.append(username)
+    init_db()
+    with connection() as conn:
+        row = conn.execute(
+            f"SELECT COALESCE(SUM(lead_count), 0) FROM lead_daily_stats WHERE {' AND '.join(clauses)}",
+            params
+        ).fetchone()
+    return int(row[0])
+
+
+def iter_leads_by_date(start_date, end_date, username=None, is_admin=False, chunk_size=500):
+    """Yield leads created between two dates in created_at order, one chunk at a time.
+
+    Each chunk is a separate keyset query on the created_at index, so memory
+    stays bounded and no read transaction is held open between chunks.
+    """
+    where, params = _date_range_clause(start_date, end_date, username, is_admin)
+    last_created_at, last_id = "", 0
+    while True:
+        # Untyped, so the keyset continues from the exact stored created_at string
+        chunk = _query_leads(
+            f"WHERE {where} AND (created_at, id) > (?, ?) ORDER BY created_at, id LIMIT ?",
+            (*params, last_created_at, last_id, int(chunk_size)),
+            typed=False
+        )
+        if chunk.empty:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_created_at, last_id = chunk["created_at"].iloc[-1], int(chunk.index[-1])
+
+
+@timed()
+def get_lead(lead_id):
+    """Load a single lead by id, or None if it does not exist"""
+    leads = _query_leads("WHERE id = ?", (int(lead_id),))
+    if leads.empty:
+        return None
+    return leads.iloc[0]
+
+
+@timed()
+def get_lead_creators():
+    """List the distinct users who have created leads"""
+    init_db()
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT created_by FROM leads WHERE created_by IS NOT NULL ORDER BY created_by"
+        ).fetchall()
+    return [row["created_by"] for row in rows]
+
+
+def _check_conflict(conn, lead_id, expected_version):
+    """Raise LeadConflictError if a conditional write matched no row"""
+    row = conn.execute("SELECT version FROM leads WHERE id = ?", (lead_id,)).fetchone()
+    if row is None:
+        raise LeadConflictError(f"Lead {lead_id} no longer exists")
+    raise LeadConflictError(
+        f"Lead {lead_id} was modified by someone else "
+        f"(version {row['version']}, expected {expected_version})"
+    )
+
+
+@timed()
+def update_lead(lead_id, updated_data, expected_version=None, note=None, author=None):
+    """Update a single lead by its id.
+
+    When expected_version is given the write only applies if the lead has not
+    changed since it was loaded; otherwise LeadConflictError is raised. A note
+    is appended to the lead's followup history in the same transaction, so the
+    update and the note are saved or lost together.
+    """
+    columns = [column for column in updated_data if column in LEAD_COLUMNS]
+    if not columns:
+        return False
+    values = [_column_value(column, updated_data[column]) for column in columns]
+    query = f"UPDATE leads SET {', '.join(f'{c} = ?' for c in columns)}, version = version + 1 WHERE id = ?"
+    params = [*values, int(lead_id)]
+    if expected_version is not None:
+        query += " AND version = ?"
+        params.append(int(expected_version))
+    try:
+        init_db()
+        with connection() as conn:
+            with conn:
+                cursor = conn.execute(query, params)
+                if cursor.rowcount == 0 and expected_version is not None:
+                    _check_conflict(conn, int(lead_id), expected_version)
+                if cursor.rowcount:
+                    if note:
+                        _insert_followup_note(conn, lead_id, note, author, updated_data.get("followup_status"))
+                    _bump_data_version(conn)
+        if cursor.rowcount:
+            _invalidate_cache()
+        return cursor.rowcount == 1
+    except LeadConflictError:
+        raise
+    except Exception as e:
+        print(f"Error updating lead: {str(e)}")
+        return False
+
+
+@timed()
+def delete_lead(lead_id, deleted_by=None, expected_version=None):
+    """Delete a lead and move it to trash.
+
+    When expected_version is given the delete only applies if the lead has not
+    changed since it was loaded; otherwise LeadConflictError is raised.
+    """
+    if deleted_by is None:
+        deleted_by = st.session_state.get("username")
+    query = "DELETE FROM leads WHERE id = ?"
+    params = [int(lead_id)]
+    if expected_version is not None:
+        query += " AND version = ?"
+        params.append(int(expected_version))
+    try:
+        init_db()
+        with connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    f"SELECT {', '.join(LEAD_COLUMNS)} FROM leads WHERE id = ?",
+                    (int(lead_id),)
+                ).fetchone()
+                if row is None and expected_version is None:
+                    return False
+                if conn.execute(query, params).rowcount == 0:
+                    _check_conflict(conn, int(lead_id), expected_version)
+                lead_data = dict(row)
+                lead_data["lead_id"] = int(lead_id)
+                conn.execute(
+                    f"INSERT INTO deleted_leads ({', '.join(TRASH_COLUMNS)}, deleted_by, original_creator) "
+                    f"VALUES ({', '.join('?' for _ in TRASH_COLUMNS)}, ?, ?)",
+                    (*(lead_data.get(c) for c in TRASH_COLUMNS), deleted_by, lead_data.get("created_by"))
+                )
+                _bump_data_version(conn)
+        _invalidate_cache()
+        return True
+    except LeadConflictError:
+        raise
+    except Exception as e:
+        print(f"Error deleting lead: {str(e)}")
+        return False
+
+
+def _trash_clause(username=None, is_admin=False):
+    """Build a WHERE clause selecting the trash rows a user may see"""
+    if is_admin:
+        return "", []
+    return "WHERE (original_creator = ? OR deleted_by = ?)", [username, username]
+
+
+@timed()
+def get_deleted_leads(username=None, is_admin=False, page=1, page_size=25):
+    """Load one page of trash visible to the given user, most recently deleted first"""
+    where, params = _trash_clause(username, is_admin)
+    offset = (max(int(page), 1) - 1) * int(page_size)
+    init_db()
+    with connection() as conn:
+        df = pd.read_sql_query(
+            f"SELECT rowid AS trash_id, {', '.join(TRASH_COLUMNS)}, original_creator AS created_by, "
+            f"deleted_at, deleted_by FROM deleted_leads {where} "
+            "ORDER BY deleted_at DESC, rowid DESC LIMIT ? OFFSET ?",
+            conn,
+            params=(*params, int(page_size), offset),
+            index_col="trash_id"
+        )
+    return df
+
+
+@timed()
+def count_deleted_leads(username=None, is_admin=False):
+    """Count trash rows visible to the given user"""
+    where, params = _trash_clause(username, is_admin)
+    init_db()
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM deleted_leads {where}", params).fetchone()[0]
+
+
+def _visible_trash_ids(conn, trash_ids, username, is_admin):
+    """Narrow requested trash ids to the ones the user may act on"""
+    trash_ids = [int(trash_id) for trash_id in trash_ids]
+    if not trash_ids:
+        return []
+    where, params = _trash_clause(username, is_admin)
+    where = f"{where} AND" if where else "WHERE"
+    rows = conn.execute(
+        f"SELECT rowid FROM deleted_leads {where} rowid IN ({', '.join('?' for _ in trash_ids)})",
+        (*params, *trash_ids)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+@timed()
+def restore_deleted_leads(trash_ids, username=None, is_admin=False):
+    """Move trash rows back into the active leads in one transaction; return how many were restored"""
+    columns = [c for c in TRASH_COLUMNS if c != "lead_id"]
+    init_db()
+    with connection() as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            visible = _visible_trash_ids(conn, trash_ids, username, is_admin)
+            if not visible:
+                return 0
+            placeholders = ", ".join("?" for _ in visible)
+            kept_ids = [row[0] for row in conn.execute(
+                f"SELECT lead_id FROM deleted_leads WHERE rowid IN ({placeholders}) "
+                "AND lead_id NOT IN (SELECT id FROM leads)",
+                visible
+            )]
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM leads").fetchone()[0]
+            # Keep the original lead id unless it has somehow been taken
+            conn.execute(
+                f"INSERT INTO leads (id, {', '.join(columns)}, created_by) "
+                f"SELECT CASE WHEN lead_id IN (SELECT id FROM leads) THEN NULL ELSE lead_id END, "
+                f"{', '.join(columns)}, original_creator FROM deleted_leads "
+                f"WHERE rowid IN ({placeholders}) ORDER BY rowid",
+                visible
+            )
+            conn.execute(f"DELETE FROM deleted_leads WHERE rowid IN ({placeholders})", visible)
+            # Leads trashed before the history table existed bring their notes back as text.
+            # The restored leads are the kept ids plus any that got a new id past last_id
+            _move_followup_notes(
+                conn, f"id IN ({', '.join('?' for _ in kept_ids)}) OR id > ?", (*kept_ids, last_id)
+            )
+            _bump_data_version(conn)
+    _invalidate_cache()
+    return len(visible)
+
+
+def _purge_trash_rows(conn, where, params):
+    """Delete trash rows and the followup history of their leads"""
+    conn.execute(
+        f"DELETE FROM followup_history WHERE lead_id IN "
+        f"(SELECT lead_id FROM deleted_leads WHERE {where} AND lead_id IS NOT NULL)",
+        params
+    )
+    return conn.execute(f"DELETE FROM deleted_leads WHERE {where}", params).rowcount
+
+
+@timed()
+def purge_deleted_leads(trash_ids, username=None, is_admin=False):
+    """Permanently delete trash rows in one transaction; return how many were purged"""
+    init_db()
+    with connection() as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            visible = _visible_trash_ids(conn, trash_ids, username, is_admin)
+            if not visible:
+                return 0
+            return _purge_trash_rows(conn, f"rowid IN ({', '.join('?' for _ in visible)})", visible)
+
+
+@timed()
+def compact_trash(retention_days=TRASH_RETENTION_DAYS):
+    """Purge trash older than the retention period and reclaim free space in the database file.
+
+    Rows unpacked from the legacy JSON trash count their age from the migration.
+    Only run on request (the Trash tab or the compact-trash command), never on startup.
+    """
+    cutoff = f"-{int(retention_days)} days"
+    init_db()
+    with connection() as conn:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            purged = _purge_trash_rows(
+                conn,
+                "deleted_at < datetime('now', ?) AND (migrated_at IS NULL OR migrated_at < datetime('now', ?))",
+                (cutoff, cutoff)
+            )
+        # Only rewrite the file when a meaningful share of it is free pages
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if page_count and free_pages / page_count > 0.25:
+            conn.execute("VACUUM")
+    return purged
+
+
+def _insert_followup_note(conn, lead_id, note, author, status):
+    """Insert a followup history row inside the caller's transaction and return its id"""
+    return conn.execute(
+        "INSERT INTO followup_history (lead_id, created_at, author, status, note) VALUES (?, ?, ?, ?, ?)",
+        (int(lead_id), datetime.now().strftime("%Y-%m-%d %H:%M:%S"), author, status, note)
+    ).lastrowid
+
+
+@timed()
+def add_followup_note(lead_id, note, author=None, status=None):
+    """Append a followup note to a lead's history and return its id"""
+    init_db()
+    with connection() as conn:
+        with conn:
+            note_id = _insert_followup_note(conn, lead_id, note, author, status)
+            _bump_data_version(conn)
+    _invalidate_cache()
+    return note_id
+
+
+@timed()
+def get_followup_notes(lead_id, limit=5, before_id=None):
+    """Load a lead's followup notes, newest first, optionally older than before_id"""
+    query = "SELECT id, created_at, author, status, note FROM followup_history WHERE lead_id = ?"
+    params = [int(lead_id)]
+    if before_id is not None:
+        query += " AND id < ?"
+        params.append(int(before_id))
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(int(limit))
+    init_db()
+    with connection() as conn:
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+
+@timed()
+def count_followup_notes(lead_id):
+    """Count a lead's followup notes"""
+    init_db()
+    with connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM followup_history WHERE lead_id = ?", (int(lead_id),)
+        ).fetchone()[0]
+
+
+# Must match the idx_leads_followup_due predicate so SQLite uses the partial index
+FOLLOWUP_DUE = "followup_status IS NOT 'Completed' AND next_followup IS NOT NULL"
+
+
+def _followup_clause(window, days, username, is_admin):
+    """Build the WHERE clause for a followup window: today, overdue or upcoming"""
+    today = datetime.now().date()
+    if window == "overdue":
+        clauses, params = ["next_followup < ?"], [today.isoformat()]
+    elif window == "upcoming":
+        clauses = ["next_followup > ?", "next_followup <= ?"]
+        params = [today.isoformat(), (today + timedelta(days=int(days))).isoformat()]
+    else:
+        clauses, params = ["next_followup = ?"], [today.isoformat()]
+    if not is_admin:
+        clauses.append("created_by = ?")
+        params.append(username)
+    # Pin the partial index so work stays bounded by open followups, not by a user's lead count
+    return f"INDEXED BY idx_leads_followup_due WHERE {FOLLOWUP_DUE} AND {' AND '.join(clauses)}", params
+
+
+@timed()
+def get_pending_followups(username=None, is_admin=False, window="today", days=7, limit=50):
+    """Load open followups in a window ("today", "overdue" or "upcoming" within days), soonest first"""
+    where, params = _followup_clause(window, days, username, is_admin)
+    return _query_leads(f"{where} ORDER BY next_followup, id LIMIT ?", (*params, int(limit)))
+
+
+@timed()
+def count_pending_followups(username=None, is_admin=False, window="today", days=7):
+    """Count open followups in a window"""
+    where, params = _followup_clause(window, days, username, is_admin)
+    init_db()
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM leads {where}", params).fetchone()[0]
+
+
+@timed()
+def complete_followup(lead_id, expected_version=None):
+    """Mark a lead's followup as done, which drops it from the followup index"""
+    return update_lead(lead_id, {
+        "followup_status": "Completed",
+        "last_followup": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }, expected_version=expected_version)
+
+
+def _rebuild_aggregates(conn):
+    """Recompute lead_daily_stats from the leads table; return the number of buckets that differed"""
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        rebuilt = f"""
+            SELECT {AGGREGATE_KEY.format(p="leads")}, COUNT(*) FROM leads GROUP BY 1, 2, 3, 4, 5, 6
+        """
+        current = """
+            SELECT created_by, day, lead_status, call_status, temperature, details_shared, lead_count
+            FROM lead_daily_stats WHERE lead_count != 0
+        """
+        mismatched = conn.execute(
+            f"SELECT (SELECT COUNT(*) FROM ({rebuilt} EXCEPT {current})) "
+            f"+ (SELECT COUNT(*) FROM ({current} EXCEPT {rebuilt}))"
+        ).fetchone()[0]
+        conn.execute("DELETE FROM lead_daily_stats")
+        conn.execute(f"INSERT INTO lead_daily_stats {rebuilt}")
+        conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('aggregates_built', ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+        )
+    return mismatched
+
+
+@timed()
+def rebuild_report_aggregates():
+    """Reconstruct the report aggregates from raw leads and return how many buckets were wrong"""
+    init_db()
+    with connection() as conn:
+        return _rebuild_aggregates(conn)
+
+
+def _report_buckets(username, is_admin, selected_creator, where, params=(), group_by_day=False):
+    """Sum aggregate buckets for the creators a report covers"""
+    clauses = [where, "lead_count != 0"]
+    params = list(params)
+    if not is_admin:
+        clauses.append("created_by = ?")
+        params.append(username or "")
+    elif selected_creator:
+        clauses.append("created_by = ?")
+        params.append(selected_creator)
+    columns = "lead_status, call_status, temperature, details_shared"
+    if group_by_day:
+        columns = "day"
+    init_db()
+    with connection() as conn:
+        return conn.execute(
+            f"SELECT {columns}, SUM(lead_count) AS lead_count FROM lead_daily_stats "
+            f"WHERE {' AND '.join(clauses)} GROUP BY {columns}",
+            params
+        ).fetchall()
+
+
+def _build_report(buckets):
+    """Summarize aggregate buckets into report metrics"""
+    report = {
+        "total_leads": 0,
+        "calls_taken": 0,
+        "hot_leads": 0,
+        "cold_leads": 0,
+        "details_shared": 0,
+        "status_breakdown": {},
+        "call_status_breakdown": {}
+    }
+    for bucket in buckets:
+        count = int(bucket["lead_count"])
+        report["total_leads"] += count
+        if bucket["call_status"] == "Call taken":
+            report["calls_taken"] += count
+        if bucket["temperature"] == "Hot":
+            report["hot_leads"] += count
+        elif bucket["temperature"] == "Cold":
+            report["cold_leads"] += count
+        if bucket["details_shared"]:
+            report["details_shared"] += count
+        for key, value in (("status_breakdown", bucket["lead_status"]),
+                           ("call_status_breakdown", bucket["call_status"])):
+            if value:
+                report[key][value] = report[key].get(value, 0) + count
+    return report
+
+
+@timed()
+def generate_daily_report(username=None, is_admin=False, selected_creator=None):
+    """Generate a summary of leads created today"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    return _build_report(
+        _report_buckets(username, is_admin, selected_creator, "day = ?", (today,))
+    )
+
+
+@timed()
+def generate_monthly_report(username=None, is_admin=False, selected_creator=None, month=None):
+    """Generate a summary of leads for a month, or all time"""
+    where, params = "day != ''", ()
+    if month:
+        where, params = "day != '' AND CAST(substr(day, 6, 2) AS INTEGER) = ?", (int(month),)
+    report = _build_report(
+        _report_buckets(username, is_admin, selected_creator, where, params)
+    )
+    report["daily_leads"] = {
+        row["day"]: int(row["lead_count"])
+        for row in _report_buckets(username, is_admin, selected_creator, where, params, group_by_day=True)
+    }
+    return report
+
+
+def _team_leaderboard(since, window_days):
+    """Per-creator lead metrics since a day, from one query and one groupby"""
+    with connection() as conn:
+        leads = pd.read_sql_query(
+            "SELECT created_by, created_at, call_status, lead_temperature, followup_status, next_followup, "
+            "(SELECT MIN(created_at) FROM followup_history WHERE lead_id = leads.id) AS first_followup_at "
+            "FROM leads WHERE created_at >= ? AND created_by != ''",
+            conn,
+            params=(since,)
+        )
+    created_at = pd.to_datetime(leads["created_at"], format="ISO8601", errors="coerce")
+    first_followup_at = pd.to_datetime(leads["first_followup_at"], format="ISO8601", errors="coerce")
+    completed = leads["followup_status"].eq("Completed")
+    leads = leads.assign(
+        call_taken=leads["call_status"].eq("Call taken"),
+        hot=leads["lead_temperature"].eq("Hot"),
+        scheduled=leads["next_followup"].fillna("").ne("") | completed,
+        completed=completed,
+        hours_to_first_followup=((first_followup_at - created_at).dt.total_seconds() / 3600).clip(lower=0)
+    )
+    board = leads.groupby("created_by").agg(
+        leads=("call_taken", "size"),
+        call_taken_rate=("call_taken", "mean"),
+        hot_ratio=("hot", "mean"),
+        followups_scheduled=("scheduled", "sum"),
+        followups_completed=("completed", "sum"),
+        median_hours_to_first_followup=("hours_to_first_followup", "median")
+    )
+    board.insert(1, "leads_per_day", board["leads"] / window_days)
+    board.insert(
+        5, "followup_completion",
+        (board["followups_completed"] / board["followups_scheduled"]).where(board["followups_scheduled"] > 0)
+    )
+    board.index.name = "creator"
+    return board.sort_values("leads", ascending=False)
+
+
+def _team_daily_leads(since, until):
+    """Leads per day per creator from the report aggregates, with every day present"""
+    with connection() as conn:
+        rows = pd.read_sql_query(
+            "SELECT day, created_by, SUM(lead_count) AS leads FROM lead_daily_stats "
+            "WHERE day >= ? AND day <= ? AND created_by != '' GROUP BY day, created_by",
+            conn,
+            params=(since, until)
+        )
+    daily = rows.pivot(index="day", columns="created_by", values="leads")
+    daily.index = pd.to_datetime(daily.index)
+    return daily.reindex(pd.date_range(since, until, freq="D"), fill_value=0).fillna(0)
+
+
+@timed()
+def get_team_analytics(window_days=30, trend_days=90):
+    """Compare every creator over the last window_days, plus a rolling trend of leads per day.
+
+    Returns a dict with "leaderboard" (one row per creator) and "trend" (a
+    window_days rolling mean of daily leads per creator over trend_days).
+    Results are cached until the lead store changes or the day rolls over;
+    the returned frames are shared and must not be modified.
+    """
+    init_db()
+    window_days, trend_days = int(window_days), int(trend_days)
+    today = datetime.now().date()
+    version = get_data_version()
+    key = (window_days, trend_days, str(today))
+    with _cache_lock:
+        if _analytics_cache["version"] == version and key in _analytics_cache["results"]:
+            return _analytics_cache["results"][key]
+
+    since = today - timedelta(days=window_days - 1)
+    trend_start = today - timedelta(days=trend_days - 1)
+    # Load window_days before the trend so its first days have a full rolling window
+    daily = _team_daily_leads(str(trend_start - timedelta(days=window_days - 1)), str(today))
+    results = {
+        "leaderboard": _team_leaderboard(str(since), window_days),
+        "trend": daily.rolling(window_days, min_periods=1).mean().loc[str(trend_start):]
+    }
+    with _cache_lock:
+        if _analytics_cache["version"] != version:
+            _analytics_cache["version"] = version
+            _analytics_cache["results"] = {}
+        _analytics_cache["results"][key] = results
+    return results
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.data_handler import-csv [path] | rebuild-aggregates | compact-trash [days]
+    command = sys.argv[1] if len(sys.argv) >= 2 else None
+    if command == "import-csv":
+        init_db()
+        count = import_csv(sys.argv[2] if len(sys.argv) > 2 else DATA_FILE)
+        print(f"Imported {count} leads")
+    elif command == "rebuild-aggregates":
+        mismatched = rebuild_report_aggregates()
+        print(f"Rebuilt report aggregates ({mismatched} buckets differed from the incremental totals)")
+    elif command == "compact-trash":
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else TRASH_RETENTION_DAYS
+        print(f"Purged {compact_trash(days)} deleted leads older than {days} days")
+    else:
+        print("Usage: python -m utils.data_handler import-csv [path] | rebuild-aggregates | compact-trash [days]")
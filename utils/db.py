@@ -0,0 +1,112 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows; processes there are not coordinated
+    fcntl = None
+
+# Directory holding the database, the legacy CSV and generated files.
+# Point every app process at the same directory to share one store.
+DATA_DIR = os.environ.get("LEADS_DATA_DIR", ".")
+DB_FILE = os.path.join(DATA_DIR, "users.db")
+
+# Idle connections kept per database file
+POOL_SIZE = 8
+
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+
+def _open(db_file):
+    """Open a SQLite connection configured for concurrent use"""
+    conn = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA busy_timeout = 30000")
+    return conn
+
+
+def data_path(*parts):
+    """Path of a file in the shared data directory"""
+    return os.path.join(DATA_DIR, *parts)
+
+
+def _pool(db_file):
+    with _pools_lock:
+        if db_file not in _pools:
+            _pools[db_file] = queue.LifoQueue(maxsize=POOL_SIZE)
+        return _pools[db_file]
+
+
+@contextmanager
+def connection(db_file=None):
+    """Borrow a pooled connection for the current thread.
+
+    Nested calls on the same thread share one connection, so a helper called
+    inside a transaction sees (and joins) that transaction. The connection goes
+    back to the pool when the outermost block exits.
+    """
+    db_file = db_file or DB_FILE
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = {}
+    if db_file in held:
+        conn, depth = held[db_file]
+        held[db_file] = (conn, depth + 1)
+        try:
+            yield conn
+        finally:
+            held[db_file] = (conn, held[db_file][1] - 1)
+        return
+
+    try:
+        conn = _pool(db_file).get_nowait()
+    except queue.Empty:
+        conn = _open(db_file)
+    held[db_file] = (conn, 1)
+    try:
+        yield conn
+    finally:
+        del held[db_file]
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _pool(db_file).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+def close_all():
+    """Close every idle pooled connection"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+@contextmanager
+def migration_lock(db_file=None):
+    """Hold an exclusive lock file next to the database while changing its schema.
+
+    Processes that start together then create tables and run one-time
+    migrations one at a time instead of racing on the same ALTER TABLE.
+    Not reentrant: do not nest it, even on one thread.
+    """
+    with open(f"{db_file or DB_FILE}.lock", "a") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from utils import data_handler
+from utils.db import connection, data_path, migration_lock
+from utils.metrics import set_user, timer
+
+ARTIFACT_DIR = data_path("report_cache")
+ARTIFACT_TTL = timedelta(days=1)
+MAX_WORKERS = 2
+# Leads read per query while writing an export
+EXPORT_CHUNK_SIZE = 5000
+# Columns of CSV and Parquet exports, in the order the export query returns them
+EXPORT_COLUMNS = data_handler.LEAD_COLUMNS + ["version", "followup_notes"]
+# A job on another machine counts as abandoned once it has not reported for this long
+JOB_STALE_AFTER = timedelta(minutes=5)
+
+# Identifies the process running a job, so other processes can tell if it died
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_jobs
+    (id TEXT PRIMARY KEY,
+     kind TEXT NOT NULL,
+     owner TEXT,
+     cache_key TEXT NOT NULL,
+     params TEXT,
+     status TEXT NOT NULL DEFAULT 'queued',
+     progress REAL NOT NULL DEFAULT 0,
+     artifact_path TEXT,
+     error TEXT,
+     pid INTEGER,
+     worker TEXT,
+     heartbeat_at TIMESTAMP,
+     created_at TIMESTAMP,
+     finished_at TIMESTAMP);
+CREATE INDEX IF NOT EXISTS idx_report_jobs_cache_key ON report_jobs(cache_key, status);
+CREATE INDEX IF NOT EXISTS idx_report_jobs_created_at ON report_jobs(created_at);
+"""
+
+PENDING_STATUSES = ("queued", "running")
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="report-job")
+_initialized = False
+
+
+def init_jobs():
+    """Create the job table and artifact directory"""
+    global _initialized
+    if _initialized:
+        return
+    data_handler.init_db()
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    with migration_lock():
+        with connection() as conn:
+            conn.executescript(JOBS_SCHEMA)
+            data_handler._add_missing_column(conn, "report_jobs", "worker", "TEXT")
+            data_handler._add_missing_column(conn, "report_jobs", "heartbeat_at", "TIMESTAMP")
+    _initialized = True
+
+
+def _pid_alive(pid):
+    """Check whether the process that claimed a job is still running"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _job_alive(job):
+    """Check whether the process that claimed a job can still finish it"""
+    host = (job["worker"] or "").rpartition(":")[0]
+    if not host or host == socket.gethostname():
+        return _pid_alive(job["pid"])
+    # Processes on other machines are judged by how recently they reported progress
+    if not job["heartbeat_at"]:
+        return False
+    heartbeat = datetime.strptime(job["heartbeat_at"], "%Y-%m-%d %H:%M:%S")
+    return datetime.now() - heartbeat < JOB_STALE_AFTER
+
+
+def _update_job(job_id, **fields):
+    """Persist job state changes"""
+    fields["heartbeat_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with connection() as conn:
+        with conn:
+            conn.execute(
+                f"UPDATE report_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+
+def _build_pdf_report(job_id, owner, params, path):
+    """Write a PDF lead report for a date range"""
+    # reportlab is only loaded once someone asks for a PDF
+    from utils.pdf_generator import MAX_ROWS, generate_pdf
+
+    start_date, end_date = params["start_date"], params["end_date"]
+    total = data_handler.count_leads_between(
+        start_date, end_date, username=owner, is_admin=params["is_admin"]
+    ) or 1
+    # Fail before drawing anything rather than part way through
+    if total > MAX_ROWS:
+        raise ValueError(
+            f"The selected range has {total:,} leads; PDF reports are limited to {MAX_ROWS:,}. "
+            "Choose a shorter date range."
+        )
+    chunks = data_handler.iter_leads_by_date(
+        start_date, end_date, username=owner, is_admin=params["is_admin"]
+    )
+    with open(path, "wb") as f:
+        generate_pdf(
+            chunks,
+            start_date,
+            end_date,
+            buffer=f,
+            on_progress=lambda rows: _update_job(job_id, progress=min(rows / total, 0.99))
+        )
+
+
+def _export_chunks(job_id, owner, params):
+    """Yield the filtered View Leads set in chunks, reporting progress as it goes"""
+    total = data_handler.count_leads(username=owner, **params) or 1
+    written = 0
+    for chunk in data_handler.iter_filtered_leads(
+            EXPORT_CHUNK_SIZE, with_notes=True, username=owner, **params):
+        yield chunk
+        written += len(chunk)
+        _update_job(job_id, progress=min(written / total, 0.99))
+
+
+def _build_csv_export(job_id, owner, params, path):
+    """Stream the filtered View Leads set to CSV"""
+    with open(path, "w", newline="") as f:
+        header = True
+        for chunk in _export_chunks(job_id, owner, params):
+            chunk.to_csv(f, header=header, index=False)
+            header = False
+        if header:
+            f.write(",".join(EXPORT_COLUMNS) + "\n")
+
+
+def _parquet_schema(pa):
+    fields = []
+    for column in EXPORT_COLUMNS:
+        if column in data_handler.DATETIME_COLUMNS:
+            fields.append(pa.field(column, pa.timestamp("us")))
+        elif column == "details_shared":
+            fields.append(pa.field(column, pa.bool_()))
+        elif column == "version":
+            fields.append(pa.field(column, pa.int64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def _build_parquet_export(job_id, owner, params, path):
+    """Stream the filtered View Leads set to Parquet, one row group per chunk"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires the pyarrow package")
+
+    schema = _parquet_schema(pa)
+    text_columns = [field.name for field in schema if pa.types.is_string(field.type)]
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in _export_chunks(job_id, owner, params):
+            chunk = chunk.astype({column: "string" for column in text_columns})
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+# Job kind -> (builder, artifact file extension)
+JOB_TYPES = {
+    "pdf_report": (_build_pdf_report, "pdf"),
+    "csv_export": (_build_csv_export, "csv"),
+    "parquet_export": (_build_parquet_export, "parquet"),
+}
+
+
+def _run_job(job_id, kind, owner, params):
+    """Execute a job on a worker thread and record the outcome"""
+    builder, extension = JOB_TYPES[kind]
+    path = os.path.join(ARTIFACT_DIR, f"{job_id}.{extension}")
+    tmp_path = f"{path}.tmp"
+    set_user(owner)
+    try:
+        _update_job(job_id, status="running", pid=os.getpid(), worker=WORKER_ID)
+        with timer(f"jobs.{kind}"):
+            builder(job_id, owner, params, tmp_path)
+        os.replace(tmp_path, path)
+        _update_job(
+            job_id,
+            status="done",
+            progress=1.0,
+            artifact_path=path,
+            finished_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+    except Exception as e:
+        print(f"Error running {kind} job {job_id}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        _update_job(
+            job_id,
+            status="failed",
+            error=str(e),
+            finished_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+
+
+def _cache_key(kind, owner, params):
+    """Identify a report by who asked, what they asked for and the data it covers.
+
+    Admins all see the same leads, so their reports are shared between them.
+    """
+    payload = json.dumps(
+        {
+            "kind": kind,
+            "owner": None if params.get("is_admin") else owner,
+            "params": params,
+            "version": data_handler.get_data_version()
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _prune_artifacts(conn):
+    """Remove jobs and artifacts older than ARTIFACT_TTL"""
+    cutoff = (datetime.now() - ARTIFACT_TTL).strftime("%Y-%m-%d %H:%M:%S")
+    rows = conn.execute(
+        "SELECT id, artifact_path FROM report_jobs WHERE created_at < ? AND status NOT IN (?, ?)",
+        (cutoff, *PENDING_STATUSES)
+    ).fetchall()
+    for row in rows:
+        if row["artifact_path"]:
+            try:
+                os.remove(row["artifact_path"])
+            except FileNotFoundError:
+                # Another process pruned it first
+                pass
+    with conn:
+        conn.executemany("DELETE FROM report_jobs WHERE id = ?", [(row["id"],) for row in rows])
+
+
+def submit_job(kind, owner, params):
+    """Queue a report job and return its id.
+
+    If the same report was already built for the current data version, or is
+    still being built, the existing job is returned instead of starting another.
+    """
+    init_jobs()
+    params = json.loads(json.dumps(params, default=str))
+    cache_key = _cache_key(kind, owner, params)
+    with connection() as conn:
+        _prune_artifacts(conn)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with conn:
+            # Processes submitting the same report at once must agree on one job
+            conn.execute("BEGIN IMMEDIATE")
+            for job in conn.execute(
+                "SELECT * FROM report_jobs WHERE cache_key = ? ORDER BY created_at DESC",
+                (cache_key,)
+            ).fetchall():
+                if job["status"] == "done" and job["artifact_path"] and os.path.exists(job["artifact_path"]):
+                    return job["id"]
+                if job["status"] in PENDING_STATUSES and _job_alive(job):
+                    return job["id"]
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO report_jobs (id, kind, owner, cache_key, params, pid, worker, heartbeat_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, owner, cache_key, json.dumps(params), os.getpid(), WORKER_ID, now, now)
+            )
+    _executor.submit(_run_job, job_id, kind, owner, params)
+    return job_id
+
+
+def get_job(job_id):
+    """Load a job's current state, or None if it does not exist"""
+    init_jobs()
+    with connection() as conn:
+        row = conn.execute("SELECT * FROM report_jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    # A job claimed by a process that has since exited will never finish
+    if job["status"] in PENDING_STATUSES and not _job_alive(job):
+        job["status"] = "failed"
+        job["error"] = "The report worker stopped before the job finished"
+    return job
+
+
+def read_artifact(job):
+    """Return the bytes of a finished job's artifact"""
+    with open(job["artifact_path"], "rb") as f:
+        return f.read()
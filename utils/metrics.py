@@ -0,0 +1,200 @@
+import bisect
+import contextvars
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.db import data_path
+
+# Local file the admin console exports histograms to
+METRICS_DB = data_path("metrics.db")
+
+# Histogram bucket upper bounds in milliseconds, 20% apart from 0.05 ms to ~2 minutes,
+# so a percentile read from the buckets is within 20% of the true value
+BUCKET_BOUNDS = [0.05 * 1.2 ** i for i in range(82)]
+
+METRICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics
+    (exported_at TIMESTAMP,
+     pid INTEGER,
+     operation TEXT,
+     username TEXT,
+     calls INTEGER,
+     rows INTEGER,
+     total_ms REAL,
+     max_ms REAL,
+     p50_ms REAL,
+     p95_ms REAL,
+     p99_ms REAL,
+     buckets TEXT);
+CREATE INDEX IF NOT EXISTS idx_metrics_operation ON metrics(operation, exported_at);
+"""
+
+# (operation, username) -> {"calls", "rows", "total_ms", "max_ms", "buckets"}
+_histograms = {}
+_lock = threading.Lock()
+_user = contextvars.ContextVar("metrics_user", default=None)
+
+
+def set_user(username):
+    """Attribute timings recorded on this thread to a user"""
+    _user.set(username)
+
+
+def record(operation, seconds, rows=None, username=None):
+    """Add one call's latency (and optional row count) to the operation's histogram"""
+    ms = seconds * 1000
+    key = (operation, username or _user.get() or "-")
+    bucket = min(bisect.bisect_left(BUCKET_BOUNDS, ms), len(BUCKET_BOUNDS))
+    with _lock:
+        stats = _histograms.get(key)
+        if stats is None:
+            stats = _histograms[key] = {
+                "calls": 0, "rows": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "buckets": [0] * (len(BUCKET_BOUNDS) + 1)
+            }
+        stats["calls"] += 1
+        stats["rows"] += rows or 0
+        stats["total_ms"] += ms
+        stats["max_ms"] = max(stats["max_ms"], ms)
+        stats["buckets"][bucket] += 1
+
+
+def _row_count(result):
+    """Rows in a returned frame or list, None for anything else"""
+    if hasattr(result, "shape"):
+        return result.shape[0]
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return None
+
+
+class _Timing:
+    rows = None
+
+
+@contextmanager
+def timer(operation):
+    """Time a block; set .rows on the yielded object to record a row count"""
+    block = _Timing()
+    started = time.perf_counter()
+    try:
+        yield block
+    finally:
+        record(operation, time.perf_counter() - started, block.rows)
+
+
+def timed(operation=None):
+    """Decorator recording each call's latency and, for frames and lists, the rows returned"""
+    def decorator(func):
+        module = func.__module__.rsplit(".", 1)[-1]
+        name = operation or f"{'main' if module == '__main__' else module}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                record(name, time.perf_counter() - started, _row_count(result))
+        return wrapper
+    return decorator
+
+
+def _percentile(buckets, calls, max_ms, q):
+    """Upper bound of the bucket holding the q-th percentile, capped at the slowest call"""
+    target = q * calls
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= target and count:
+            return min(BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else max_ms, max_ms)
+    return max_ms
+
+
+def _summarize(operation, username, stats):
+    calls = stats["calls"]
+    return {
+        "operation": operation,
+        "user": username,
+        "calls": calls,
+        "rows": stats["rows"],
+        "mean_ms": round(stats["total_ms"] / calls, 2),
+        "p50_ms": round(_percentile(stats["buckets"], calls, stats["max_ms"], 0.50), 2),
+        "p95_ms": round(_percentile(stats["buckets"], calls, stats["max_ms"], 0.95), 2),
+        "p99_ms": round(_percentile(stats["buckets"], calls, stats["max_ms"], 0.99), 2),
+        "max_ms": round(stats["max_ms"], 2),
+    }
+
+
+def _copy():
+    with _lock:
+        return {
+            key: {**stats, "buckets": list(stats["buckets"])}
+            for key, stats in _histograms.items()
+        }
+
+
+def snapshot(by_user=False, username=None):
+    """Return latency summaries per operation, or per operation and user, slowest p95 first"""
+    merged = {}
+    for (operation, user), stats in _copy().items():
+        if username is not None and user != username:
+            continue
+        key = (operation, user if by_user else None)
+        total = merged.get(key)
+        if total is None:
+            merged[key] = stats
+            continue
+        total["calls"] += stats["calls"]
+        total["rows"] += stats["rows"]
+        total["total_ms"] += stats["total_ms"]
+        total["max_ms"] = max(total["max_ms"], stats["max_ms"])
+        total["buckets"] = [a + b for a, b in zip(total["buckets"], stats["buckets"])]
+    summaries = [_summarize(operation, user, stats) for (operation, user), stats in merged.items()]
+    if not by_user:
+        for summary in summaries:
+            del summary["user"]
+    return sorted(summaries, key=lambda s: s["p95_ms"], reverse=True)
+
+
+def users():
+    """List the users with recorded timings"""
+    with _lock:
+        return sorted({user for _, user in _histograms})
+
+
+def reset():
+    """Forget all recorded timings"""
+    with _lock:
+        _histograms.clear()
+
+
+def export_sqlite(path=None):
+    """Append the current histograms to a local SQLite file and return how many were written"""
+    rows = []
+    exported_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for (operation, user), stats in _copy().items():
+        summary = _summarize(operation, user, stats)
+        rows.append((
+            exported_at, os.getpid(), operation, user, stats["calls"], stats["rows"],
+            round(stats["total_ms"], 3), summary["max_ms"], summary["p50_ms"],
+            summary["p95_ms"], summary["p99_ms"], json.dumps(stats["buckets"])
+        ))
+    conn = sqlite3.connect(path or METRICS_DB, timeout=30)
+    try:
+        conn.executescript(METRICS_SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+    finally:
+        conn.close()
+    return len(rows)
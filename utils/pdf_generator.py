@@ -0,0 +1,175 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from utils.metrics import timed
+
+PAGE_SIZE = landscape(A4)
+MARGIN = 15 * mm
+ROW_HEIGHT = 6 * mm
+FONT = "Helvetica"
+BOLD_FONT = "Helvetica-Bold"
+FONT_SIZE = 8
+
+# reportlab keeps every finished page in memory until the document is saved,
+# so memory grows with the row count (roughly 0.8 KB per row); longer date
+# ranges have to be split into several reports
+MAX_ROWS = 50_000
+
+# (column, heading, width in mm)
+REPORT_COLUMNS = [
+    ("name", "Name", 40),
+    ("phone", "Phone", 28),
+    ("email", "Email", 55),
+    ("lead_status", "Lead Status", 24),
+    ("call_status", "Call Status", 26),
+    ("lead_temperature", "Temp", 14),
+    ("created_by", "Created By", 28),
+    ("created_at", "Created At", 32),
+]
+
+
+def _fit(text, width):
+    """Truncate text so it fits in a table cell"""
+    if stringWidth(text, FONT, FONT_SIZE) <= width:
+        return text
+    while text and stringWidth(text + "...", FONT, FONT_SIZE) > width:
+        text = text[:-1]
+    return text + "..."
+
+
+def _cell(value):
+    """Format a lead field for the table"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+class _ReportWriter:
+    """Draws lead rows onto the PDF page by page as they arrive.
+
+    The canvas holds every finished page until finish() saves the document.
+    """
+
+    def __init__(self, buffer, start_date, end_date, max_rows=MAX_ROWS):
+        self.canvas = canvas.Canvas(buffer, pagesize=PAGE_SIZE, pageCompression=1)
+        self.canvas.setTitle("Lead Report")
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_rows = max_rows
+        self.page = 0
+        self.y = 0
+        self.totals = {"total_leads": 0, "calls_taken": 0, "hot_leads": 0, "cold_leads": 0}
+        self.status_breakdown = {}
+        self._new_page()
+
+    def _new_page(self):
+        if self.page:
+            self.canvas.showPage()
+        self.page += 1
+        width, height = PAGE_SIZE
+        self.y = height - MARGIN
+        if self.page == 1:
+            self.canvas.setFont(BOLD_FONT, 16)
+            self.canvas.drawString(MARGIN, self.y, "Lead Report")
+            self.y -= 8 * mm
+            self.canvas.setFont(FONT, 10)
+            self.canvas.drawString(
+                MARGIN, self.y,
+                f"Period: {self.start_date} to {self.end_date}    "
+                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+            )
+            self.y -= 10 * mm
+        self.canvas.setFont(FONT, 8)
+        self.canvas.drawRightString(width - MARGIN, MARGIN / 2, f"Page {self.page}")
+        self._draw_header()
+
+    def _draw_header(self):
+        x = MARGIN
+        self.canvas.setFont(BOLD_FONT, FONT_SIZE)
+        for _, heading, width in REPORT_COLUMNS:
+            self.canvas.drawString(x, self.y, heading)
+            x += width * mm
+        self.y -= 2 * mm
+        self.canvas.line(MARGIN, self.y, PAGE_SIZE[0] - MARGIN, self.y)
+        self.y -= ROW_HEIGHT - 2 * mm
+        self.canvas.setFont(FONT, FONT_SIZE)
+
+    def add_rows(self, leads):
+        if self.totals["total_leads"] + len(leads) > self.max_rows:
+            raise ValueError(
+                f"PDF reports are limited to {self.max_rows:,} leads. Choose a shorter date range."
+            )
+        for lead in leads.to_dict("records"):
+            if self.y < MARGIN + ROW_HEIGHT:
+                self._new_page()
+            x = MARGIN
+            for column, _, width in REPORT_COLUMNS:
+                self.canvas.drawString(x, self.y, _fit(_cell(lead.get(column)), width * mm - 2 * mm))
+                x += width * mm
+            self.y -= ROW_HEIGHT
+            self._count(lead)
+
+    def _count(self, lead):
+        self.totals["total_leads"] += 1
+        if lead.get("call_status") == "Call taken":
+            self.totals["calls_taken"] += 1
+        if lead.get("lead_temperature") == "Hot":
+            self.totals["hot_leads"] += 1
+        elif lead.get("lead_temperature") == "Cold":
+            self.totals["cold_leads"] += 1
+        status = _cell(lead.get("lead_status"))
+        if status:
+            self.status_breakdown[status] = self.status_breakdown.get(status, 0) + 1
+
+    def finish(self):
+        """Append the summary section and write the document out"""
+        lines = [
+            ("Total Leads", self.totals["total_leads"]),
+            ("Calls Taken", self.totals["calls_taken"]),
+            ("Hot Leads", self.totals["hot_leads"]),
+            ("Cold Leads", self.totals["cold_leads"]),
+        ] + sorted(self.status_breakdown.items())
+        if self.y < MARGIN + (len(lines) + 2) * ROW_HEIGHT:
+            self.canvas.showPage()
+            self.page += 1
+            self.y = PAGE_SIZE[1] - MARGIN
+        self.y -= ROW_HEIGHT
+        self.canvas.setFont(BOLD_FONT, 12)
+        self.canvas.drawString(MARGIN, self.y, "Summary")
+        self.y -= ROW_HEIGHT
+        self.canvas.setFont(FONT, 10)
+        for label, value in lines:
+            self.canvas.drawString(MARGIN, self.y, f"{label}: {value}")
+            self.y -= ROW_HEIGHT
+        self.canvas.save()
+
+
+@timed()
+def generate_pdf(leads, start_date, end_date, buffer=None, on_progress=None, max_rows=MAX_ROWS):
+    """Render a lead report into a PDF buffer.
+
+    leads may be a DataFrame or an iterable of DataFrame chunks, so rows are
+    drawn as they are read instead of being collected first. The drawn pages
+    stay in memory until the document is written, so memory still grows with
+    the report size; more than max_rows leads raises ValueError.
+    on_progress, if given, is called with the number of rows drawn so far.
+    """
+    if isinstance(leads, pd.DataFrame):
+        leads = [leads]
+
+    if buffer is None:
+        buffer = io.BytesIO()
+    writer = _ReportWriter(buffer, start_date, end_date, max_rows)
+    for chunk in leads:
+        writer.add_rows(chunk)
+        if on_progress:
+            on_progress(writer.totals["total_leads"])
+    writer.finish()
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,93 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from utils.data_handler import save_lead
+from utils.bulk_import import import_leads
+from utils.metrics import timed
+
+
+@timed()
+def show_add_lead_form():
+    st.header("Add New Lead")
+
+    with st.form("lead_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            lead_name = st.text_input("Lead Name*")
+            phone = st.text_input("Phone Number*")
+            email = st.text_input("Email")
+            lead_temperature = st.selectbox(
+                "Lead Temperature*",
+                ["Hot", "Cold"]
+            )
+
+        with col2:
+            lead_status = st.selectbox(
+                "Lead Status*",
+                ["Student", "Working", "Unemployed", "Fresher"]
+            )
+            call_status = st.selectbox(
+                "Call Status*",
+                ["Call taken", "Busy", "RNP", "Out of service", "Abroad", "Cut the call"]
+            )
+            details_shared = st.checkbox("Details Shared with Lead", value=False)
+
+        notes = st.text_area("Notes")
+
+        submitted = st.form_submit_button("Save Lead")
+
+        if submitted:
+            if not lead_name or not phone:
+                st.error("Please fill in all required fields marked with *")
+            else:
+                lead_data = {
+                    "name": lead_name,
+                    "phone": phone,
+                    "email": email,
+                    "lead_status": lead_status,
+                    "call_status": call_status,
+                    "notes": notes,
+                    "date_added": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "last_followup": "",
+                    "lead_temperature": lead_temperature,
+                    "details_shared": details_shared,
+                    "created_by": st.session_state.username,
+                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+                save_lead(lead_data, st.session_state.username)
+                st.success("Lead saved successfully!")
+
+    # Bulk import for campaign lists
+    with st.expander("📤 Bulk Import Leads"):
+        st.caption(
+            "Upload a CSV or Excel (.xlsx) file with at least name and phone columns. "
+            "Dates must be written as YYYY-MM-DD, optionally followed by a time. "
+            "Rows whose phone or email already exists are skipped as duplicates."
+        )
+        uploaded_file = st.file_uploader("Lead file", type=["csv", "xlsx"])
+
+        if uploaded_file is not None and st.button("Import Leads"):
+            try:
+                with st.spinner("Importing leads..."):
+                    report = import_leads(uploaded_file, st.session_state.username)
+            except Exception as e:
+                st.error(f"Could not import the file: {str(e)}")
+                return
+
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("Rows", report["rows"])
+            with col2:
+                st.metric("Accepted", report["accepted"])
+            with col3:
+                st.metric("Rejected", report["rejected"])
+            with col4:
+                st.metric("Duplicates", report["duplicates"])
+            with col5:
+                st.metric("Rows/sec", f"{report['rows_per_sec']:,.0f}")
+
+            if report["rejected_rows"]:
+                st.markdown("**Rejected rows**")
+                st.dataframe(pd.DataFrame(report["rejected_rows"]), hide_index=True)
@@ -0,0 +1,55 @@
+import streamlit as st
+
+from utils.data_handler import get_team_analytics
+from utils.metrics import timed
+
+# Rolling windows offered on the team dashboard, in days
+WINDOWS = {"Last 7 days": 7, "Last 30 days": 30}
+
+# Days of history shown on the trend chart
+TREND_DAYS = 90
+
+
+@timed()
+def show_team_analytics():
+    st.header("Team Analytics")
+
+    window_label = st.radio("Window", list(WINDOWS), horizontal=True)
+    window_days = WINDOWS[window_label]
+    analytics = get_team_analytics(window_days=window_days, trend_days=TREND_DAYS)
+    leaderboard = analytics["leaderboard"]
+
+    if leaderboard.empty:
+        st.info(f"No leads created in the last {window_days} days")
+        return
+
+    # Team totals
+    col1, col2, col3, col4 = st.columns(4)
+    total = int(leaderboard["leads"].sum())
+    with col1:
+        st.metric("Leads", total)
+    with col2:
+        st.metric("Leads / Day", f"{total / window_days:.1f}")
+    with col3:
+        st.metric("Call Taken Rate", f"{(leaderboard['call_taken_rate'] * leaderboard['leads']).sum() / total:.0%}")
+    with col4:
+        st.metric("Hot Ratio", f"{(leaderboard['hot_ratio'] * leaderboard['leads']).sum() / total:.0%}")
+
+    st.subheader("Leaderboard")
+    st.dataframe(
+        leaderboard,
+        use_container_width=True,
+        column_config={
+            "leads": st.column_config.NumberColumn("Leads"),
+            "leads_per_day": st.column_config.NumberColumn("Leads / Day", format="%.1f"),
+            "call_taken_rate": st.column_config.ProgressColumn("Call Taken", format="percent", min_value=0, max_value=1),
+            "hot_ratio": st.column_config.ProgressColumn("Hot", format="percent", min_value=0, max_value=1),
+            "followups_scheduled": st.column_config.NumberColumn("Followups"),
+            "followup_completion": st.column_config.ProgressColumn("Completed", format="percent", min_value=0, max_value=1),
+            "followups_completed": None,
+            "median_hours_to_first_followup": st.column_config.NumberColumn("Hours to First Followup", format="%.1f")
+        }
+    )
+
+    st.subheader(f"Leads per Day ({window_days}-day rolling average)")
+    st.line_chart(analytics["trend"])
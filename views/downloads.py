@@ -0,0 +1,29 @@
+import streamlit as st
+
+from utils.jobs import get_job, read_artifact
+
+
+@st.fragment(run_every=1)
+def poll_job(job_id):
+    # Rerun the whole page once the background job leaves the queue
+    job = get_job(job_id)
+    if job is None or job["status"] not in ("queued", "running"):
+        st.rerun()
+    st.progress(job["progress"], text=f"Preparing file... {int(job['progress'] * 100)}%")
+
+
+def show_job_result(session_key, label, file_name, mime):
+    job_id = st.session_state.get(session_key)
+    if not job_id:
+        return
+
+    job = get_job(job_id)
+    if job is None:
+        del st.session_state[session_key]
+    elif job["status"] in ("queued", "running"):
+        poll_job(job_id)
+    elif job["status"] == "done":
+        # A callable is only read when the button is clicked, not on every rerun
+        st.download_button(label, lambda: read_artifact(job), file_name, mime, key=f"download_{job_id}")
+    else:
+        st.error(f"Failed to prepare the file: {job['error']}")
@@ -0,0 +1,371 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from utils.data_handler import (
+    update_lead, delete_lead, get_deleted_leads, count_deleted_leads, restore_deleted_leads,
+    purge_deleted_leads, compact_trash, TRASH_RETENTION_DAYS, get_pending_followups,
+    count_pending_followups, complete_followup, get_followup_notes,
+    count_followup_notes, LeadConflictError, count_leads, load_leads_page, get_lead, get_lead_creators
+)
+from utils.jobs import submit_job
+from utils.metrics import timed
+from views.downloads import show_job_result
+
+# Page sizes offered on the View Leads table
+PAGE_SIZES = [25, 50, 100]
+
+# Deleted leads shown per Trash page
+TRASH_PAGE_SIZE = 25
+
+# Followup notes shown per "Load more" step
+NOTES_PAGE_SIZE = 5
+
+
+@timed()
+def show_lead_details(lead_id, lead):
+    st.subheader(f"📞 {lead['name']} - {lead['phone']}")
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        if st.session_state.is_admin:
+            st.markdown(f"**👤 Created by:** {str(lead.get('created_by', 'Unknown'))}")
+            if pd.notna(lead['created_at']):
+                st.markdown(f"**🕒 Created at:** {lead['created_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+            st.markdown("---")
+
+        st.write(f"**Email:** {lead.get('email', '')}")
+        st.write(f"**Lead Status:** {lead['lead_status']}")
+        st.write(f"**Call Status:** {lead['call_status']}")
+        st.write(f"**Temperature:** {lead.get('lead_temperature', 'Not specified')}")
+
+        # Display initial remarks
+        if lead.get('notes'):
+            st.markdown("**📝 Initial Remarks:**")
+            st.info(str(lead['notes']))
+
+        # Display followup history, most recent first, a few notes at a time
+        notes_limit_key = f"notes_limit_{lead_id}"
+        notes_limit = st.session_state.get(notes_limit_key, NOTES_PAGE_SIZE)
+        notes = get_followup_notes(lead_id, limit=notes_limit)
+        if notes:
+            st.markdown("**📋 Followup History:**")
+            for note in notes:
+                author = f" ({note['author']})" if note['author'] else ""
+                st.warning(f"[{note['created_at']}]{author} {note['note']}")
+            if len(notes) == notes_limit and count_followup_notes(lead_id) > notes_limit:
+                if st.button("Load more notes", key=f"more_notes_{lead_id}"):
+                    st.session_state[notes_limit_key] = notes_limit + NOTES_PAGE_SIZE
+                    st.rerun()
+
+    with col2:
+        # Edit form with proper error handling
+        with st.form(key=f"edit_form_{lead_id}"):
+            # Handle lead status with default value
+            current_status = lead.get('lead_status', 'Student')
+            if pd.isna(current_status):
+                current_status = 'Student'
+
+            new_status = st.selectbox(
+                "Update Lead Status",
+                ["Student", "Working", "Unemployed", "Fresher"],
+                index=["Student", "Working", "Unemployed", "Fresher"].index(current_status)
+            )
+
+            # Handle call status with default value
+            current_call_status = lead.get('call_status', 'Call taken')
+            if pd.isna(current_call_status):
+                current_call_status = 'Call taken'
+
+            new_call_status = st.selectbox(
+                "Update Call Status",
+                ["Call taken", "Busy", "RNP", "Out of service", "Abroad", "Cut the call"],
+                index=["Call taken", "Busy", "RNP", "Out of service", "Abroad", "Cut the call"].index(current_call_status)
+            )
+
+            # Handle lead temperature with default value
+            current_temp = lead.get('lead_temperature', 'Cold')
+            if pd.isna(current_temp):
+                current_temp = 'Cold'
+
+            new_temperature = st.selectbox(
+                "Update Lead Temperature",
+                ["Hot", "Cold"],
+                index=["Hot", "Cold"].index(current_temp)
+            )
+
+            # Add followup tracking
+            next_followup = st.date_input(
+                "Schedule Next Followup",
+                min_value=datetime.now().date(),
+                value=None if pd.isna(lead.get('next_followup')) else lead['next_followup'].date()
+            )
+
+            followup_status = st.selectbox(
+                "Followup Status",
+                ["Pending", "Completed", "Rescheduled", "No Response"],
+                index=["Pending", "Completed", "Rescheduled", "No Response"].index(
+                    lead.get('followup_status', 'Pending') if pd.notna(lead.get('followup_status')) else 'Pending'
+                )
+            )
+
+            followup_note = st.text_area(
+                "Add Followup Note",
+                key=f"followup_note_{lead_id}",
+                height=100,
+                disabled=False
+            )
+
+            if st.form_submit_button("Update Lead"):
+                try:
+                    updated_data = {
+                        "lead_status": new_status,
+                        "call_status": new_call_status,
+                        "lead_temperature": new_temperature,
+                        "last_followup": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "next_followup": next_followup.strftime("%Y-%m-%d") if next_followup else None,
+                        "followup_status": followup_status
+                    }
+
+                    # The followup note is appended to the lead's history together with the update
+                    if update_lead(lead_id, updated_data, expected_version=lead['version'],
+                                   note=followup_note, author=st.session_state.username):
+                        st.success("Lead updated successfully!")
+                        st.rerun()
+                    else:
+                        st.error("Failed to update lead. Please try again.")
+                except LeadConflictError:
+                    st.warning("This lead was changed by someone else. Reload the page to see the latest version before updating.")
+                except Exception as e:
+                    st.error(f"An error occurred: {str(e)}")
+
+        # Add delete button outside the form
+        if st.button("🗑️ Delete Lead", key=f"delete_{lead_id}"):
+            try:
+                if delete_lead(lead_id, expected_version=lead['version']):
+                    st.success("Lead deleted successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete lead. Please check if the lead exists and try again.")
+            except LeadConflictError:
+                st.warning("This lead was changed by someone else. Reload the page before deleting it.")
+
+
+@timed()
+def show_leads_view():
+    st.header("View Leads")
+
+    search = st.text_input(
+        "🔍 Search leads",
+        placeholder="Name, phone, email or notes",
+        key="leads_search"
+    )
+
+    # Filter options
+    col1, col2, col3 = st.columns(3)
+
+    # List of month names
+    months = [
+        "All", "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December"
+    ]
+
+    with col1:
+        month = st.selectbox(
+            "Select Month",
+            months
+        )
+
+    with col2:
+        status_filter = st.multiselect(
+            "Lead Status",
+            ["Student", "Working", "Unemployed", "Fresher"]
+        )
+
+    with col3:
+        call_status_filter = st.multiselect(
+            "Call Status",
+            ["Call taken", "Busy", "RNP", "Out of service", "Abroad", "Cut the call"]
+        )
+
+    # Add creator filter for admin users
+    creator_filter = []
+    if st.session_state.is_admin:
+        creator_filter = st.multiselect(
+            "Filter by Creator",
+            ["All"] + get_lead_creators()
+        )
+
+    # Filters are pushed down to the data layer so only one page is loaded
+    filters = {
+        "username": st.session_state.username,
+        "is_admin": st.session_state.is_admin,
+        "month": months.index(month) if month != "All" else None,
+        "status_filter": status_filter,
+        "call_status_filter": call_status_filter,
+        "creators": creator_filter if creator_filter and "All" not in creator_filter else None,
+        "search": search.strip() or None
+    }
+
+    # Add tab for viewing active/deleted leads
+    tab1, tab2 = st.tabs(["Active Leads", "Trash"])
+
+    with tab1:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page_size = st.selectbox("Leads per page", PAGE_SIZES, key="leads_page_size")
+
+        total = count_leads(**filters)
+        page_count = max((total + page_size - 1) // page_size, 1)
+        # Keep the page in range when filters shrink the result set
+        if st.session_state.get("leads_page", 1) > page_count:
+            st.session_state.leads_page = page_count
+        with col2:
+            page = st.number_input(
+                f"Page (of {page_count})",
+                min_value=1,
+                max_value=page_count,
+                step=1,
+                key="leads_page"
+            )
+
+        page_leads = load_leads_page(page=page, page_size=page_size, **filters)
+
+        if not page_leads.empty:
+            st.caption(f"Showing {len(page_leads)} of {total} leads")
+
+            table_columns = ["name", "phone", "lead_status", "call_status", "lead_temperature", "next_followup", "created_at"]
+            if st.session_state.is_admin:
+                table_columns.append("created_by")
+
+            # Compact table; the edit form is only built for the selected lead
+            selection = st.dataframe(
+                page_leads[table_columns],
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                column_config={
+                    "next_followup": st.column_config.DateColumn("next_followup", format="YYYY-MM-DD"),
+                    "created_at": st.column_config.DatetimeColumn("created_at", format="YYYY-MM-DD HH:mm:ss")
+                },
+                key=f"leads_table_{page}_{page_size}"
+            )
+
+            selected_rows = selection.selection.rows
+            if selected_rows:
+                lead_id = page_leads.index[selected_rows[0]]
+                lead = get_lead(lead_id)
+                if lead is not None:
+                    st.markdown("---")
+                    show_lead_details(lead_id, lead)
+                else:
+                    st.warning("This lead no longer exists.")
+            else:
+                st.info("Select a lead in the table to view details and update it")
+
+            # Export options; files are built in the background and reused until the data changes
+            export_filters = {k: v for k, v in filters.items() if k != "username"}
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("Export to CSV"):
+                    st.session_state.csv_job = submit_job("csv_export", st.session_state.username, export_filters)
+                show_job_result("csv_job", "Download CSV", "leads.csv", "text/csv")
+            with col2:
+                if st.button("Export to Parquet"):
+                    st.session_state.parquet_job = submit_job(
+                        "parquet_export", st.session_state.username, export_filters
+                    )
+                show_job_result("parquet_job", "Download Parquet", "leads.parquet", "application/vnd.apache.parquet")
+        else:
+            st.info("No leads found matching the criteria")
+
+    with tab2:
+        trash_access = {
+            "username": st.session_state.username,
+            "is_admin": st.session_state.is_admin or st.session_state.is_superuser
+        }
+        trash_total = count_deleted_leads(**trash_access)
+        trash_pages = max((trash_total + TRASH_PAGE_SIZE - 1) // TRASH_PAGE_SIZE, 1)
+        if st.session_state.get("trash_page", 1) > trash_pages:
+            st.session_state.trash_page = trash_pages
+        trash_page = st.number_input(
+            f"Page (of {trash_pages})",
+            min_value=1,
+            max_value=trash_pages,
+            step=1,
+            key="trash_page"
+        )
+
+        deleted_leads = get_deleted_leads(page=trash_page, page_size=TRASH_PAGE_SIZE, **trash_access)
+
+        if not deleted_leads.empty:
+            st.caption(f"Showing {len(deleted_leads)} of {trash_total} deleted leads")
+            selection = st.dataframe(
+                deleted_leads[["name", "phone", "email", "lead_status", "call_status", "created_by", "deleted_by", "deleted_at"]],
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="multi-row",
+                key=f"trash_table_{trash_page}"
+            )
+            selected_ids = [deleted_leads.index[row] for row in selection.selection.rows]
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("♻️ Restore Selected", disabled=not selected_ids):
+                    restored = restore_deleted_leads(selected_ids, **trash_access)
+                    st.success(f"Restored {restored} leads")
+                    st.rerun()
+            with col2:
+                if st.button("❌ Delete Selected Permanently", disabled=not selected_ids):
+                    purged = purge_deleted_leads(selected_ids, **trash_access)
+                    st.success(f"Permanently deleted {purged} leads")
+                    st.rerun()
+        else:
+            st.info("No deleted leads found")
+
+        if st.session_state.is_admin:
+            if st.button(f"🧹 Purge trash older than {TRASH_RETENTION_DAYS} days"):
+                purged = compact_trash()
+                st.success(f"Purged {purged} deleted leads")
+
+
+# Followups listed per sidebar section; the rest are summarized as a count
+FOLLOWUP_LIMIT = 20
+
+
+@timed()
+def show_followups(title, window, empty_message):
+    st.markdown(title)
+    pending_followups = get_pending_followups(
+        username=st.session_state.username,
+        is_admin=st.session_state.is_admin,
+        window=window,
+        limit=FOLLOWUP_LIMIT
+    )
+
+    if not pending_followups.empty:
+        for _, followup in pending_followups.iterrows():
+            with st.expander(f"📞 {followup['name']}"):
+                st.write(f"**Phone:** {followup['phone']}")
+                if pd.notna(followup['next_followup']):
+                    st.write(f"**Scheduled:** {followup['next_followup'].strftime('%Y-%m-%d')}")
+                st.write(f"**Status:** {followup['followup_status'] if pd.notna(followup['followup_status']) else 'Pending'}")
+                if st.button("Mark Complete", key=f"complete_{window}_{followup.name}"):
+                    try:
+                        complete_followup(followup.name, expected_version=followup['version'])
+                        st.rerun()
+                    except LeadConflictError:
+                        st.warning("This lead was changed by someone else. Reload the page before completing its followup.")
+
+        if len(pending_followups) == FOLLOWUP_LIMIT:
+            total = count_pending_followups(
+                username=st.session_state.username,
+                is_admin=st.session_state.is_admin,
+                window=window
+            )
+            if total > FOLLOWUP_LIMIT:
+                st.caption(f"...and {total - FOLLOWUP_LIMIT} more")
+    else:
+        st.info(empty_message)
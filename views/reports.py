@@ -0,0 +1,133 @@
+import streamlit as st
+import pandas as pd
+
+from utils.data_handler import generate_daily_report, generate_monthly_report, get_lead_creators, count_leads_between
+from utils.jobs import submit_job
+from utils.metrics import timed
+from views.downloads import show_job_result
+
+
+@timed()
+def show_daily_summary():
+    st.header("Performance Summary")
+
+    # Initialize selected_creator before the if statement
+    selected_creator = "All"
+
+    # Add creator selection for admin users
+    if st.session_state.is_admin:
+        creators = ["All"] + get_lead_creators()
+        selected_creator = st.selectbox("Select Team Member", creators)
+
+    # Add time period selection
+    col1, col2 = st.columns(2)
+    with col1:
+        view_type = st.radio("View Type", ["Daily", "Monthly"])
+
+    with col2:
+        if view_type == "Monthly":
+            months = [
+                "All", "January", "February", "March", "April", "May", "June",
+                "July", "August", "September", "October", "November", "December"
+            ]
+            selected_month = st.selectbox("Select Month", months)
+            month_num = months.index(selected_month) if selected_month != "All" else None
+        else:
+            month_num = None
+
+    try:
+        if view_type == "Daily":
+            report = generate_daily_report(
+                username=st.session_state.username,
+                is_admin=st.session_state.is_admin,
+                selected_creator=selected_creator if selected_creator != "All" else None
+            )
+        else:
+            report = generate_monthly_report(
+                username=st.session_state.username,
+                is_admin=st.session_state.is_admin,
+                selected_creator=selected_creator if selected_creator != "All" else None,
+                month=month_num
+            )
+
+        # Display metrics in columns
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            st.metric("Total Leads", report.get("total_leads", 0))
+        with col2:
+            st.metric("Calls Taken", report.get("calls_taken", 0))
+        with col3:
+            st.metric("Hot Leads", report.get("hot_leads", 0))
+        with col4:
+            st.metric("Cold Leads", report.get("cold_leads", 0))
+        with col5:
+            st.metric("Details Shared", report.get("details_shared", 0))
+
+        # Display breakdowns
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Status Breakdown")
+            status_breakdown = report.get("status_breakdown", {})
+            if status_breakdown:
+                st.json(status_breakdown)
+            else:
+                st.info("No status data available")
+
+        with col2:
+            st.subheader("Call Status Breakdown")
+            call_status_breakdown = report.get("call_status_breakdown", {})
+            if call_status_breakdown:
+                st.json(call_status_breakdown)
+            else:
+                st.info("No call status data available")
+
+        # Display daily leads chart for monthly view
+        if view_type == "Monthly" and "daily_leads" in report and report["daily_leads"]:
+            st.subheader("Daily Lead Distribution")
+            daily_leads_df = pd.DataFrame.from_dict(
+                report["daily_leads"],
+                orient='index',
+                columns=['count']
+            )
+            daily_leads_df.index = pd.to_datetime(daily_leads_df.index)
+            st.line_chart(daily_leads_df)
+
+    except Exception as e:
+        st.error(f"An error occurred while generating the report: {str(e)}")
+        st.info("Please try again or contact support if the issue persists.")
+
+
+@timed()
+def show_reports():
+    st.header("Generate Reports")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        start_date = st.date_input("Start Date")
+
+    with col2:
+        end_date = st.date_input("End Date")
+
+    if st.button("Generate PDF Report"):
+        lead_count = count_leads_between(
+            start_date,
+            end_date,
+            username=st.session_state.username,
+            is_admin=st.session_state.is_admin
+        )
+
+        if lead_count:
+            # Leads are streamed into the PDF by a background job
+            st.session_state.pdf_job = submit_job("pdf_report", st.session_state.username, {
+                "start_date": start_date,
+                "end_date": end_date,
+                "is_admin": st.session_state.is_admin
+            })
+        else:
+            st.session_state.pop("pdf_job", None)
+            st.warning("No data available for the selected date range")
+
+    show_job_result("pdf_job", "Download Report", "lead_report.pdf", "application/pdf")